@@ -5,13 +5,16 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
-from app.core.database import Base
+from app.core.database import Base, db_url
 from app.models import *  # noqa: F401,F403 — ensure all models registered
 
 config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Migrate the database the app is configured for (USE_SQLITE / DATABASE_URL), not alembic.ini's placeholder
+config.set_main_option("sqlalchemy.url", db_url.replace("%", "%%"))
+
 target_metadata = Base.metadata
 
 
@@ -0,0 +1,66 @@
+"""query indexes for list, stats and FK lookups
+
+Composite (filter, created_at DESC, id DESC) indexes backing the list
+endpoints' ORDER BY / keyset cursor, plus the FK-column indexes used by
+device and mission lookups.
+
+Revision ID: 8f3b6d2e5a41
+Revises: 4c1e2a7d9b10
+Create Date: 2026-10-16 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3b6d2e5a41"
+down_revision: Union[str, None] = "4c1e2a7d9b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_CT_ID = [sa.text("created_at DESC"), sa.text("id DESC")]
+
+
+def upgrade() -> None:
+    op.create_index("ix_missions_device_id", "missions", ["device_id"])
+    op.create_index("ix_missions_status_created", "missions", ["status", sa.text("created_at DESC")])
+    op.create_index("ix_missions_created", "missions", [sa.text("created_at DESC")])
+
+    op.create_index("ix_det_mission_ct", "detection_results", ["mission_id", *_CT_ID])
+    op.create_index("ix_det_device_ct", "detection_results", ["device_id", *_CT_ID])
+    op.create_index("ix_det_ct", "detection_results", _CT_ID)
+
+    op.create_index("ix_tracking_mission_created", "tracking_results", ["mission_id", sa.text("created_at DESC")])
+
+    op.create_index("ix_training_jobs_status_created", "training_jobs", ["status", sa.text("created_at DESC")])
+    op.create_index("ix_training_jobs_created", "training_jobs", [sa.text("created_at DESC")])
+
+    op.create_index("ix_alerts_device_id", "alerts", ["device_id"])
+    op.create_index("ix_alerts_mission_id", "alerts", ["mission_id"])
+    op.create_index("ix_alert_sev_ack_ct", "alerts", ["severity", "acknowledged", *_CT_ID])
+    op.create_index("ix_alert_ct", "alerts", _CT_ID)
+    op.create_index(
+        "ix_alert_unack_ct", "alerts", _CT_ID,
+        postgresql_where=sa.text("NOT acknowledged"),
+        sqlite_where=sa.text("NOT acknowledged"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_alert_unack_ct", table_name="alerts")
+    op.drop_index("ix_alert_ct", table_name="alerts")
+    op.drop_index("ix_alert_sev_ack_ct", table_name="alerts")
+    op.drop_index("ix_alerts_mission_id", table_name="alerts")
+    op.drop_index("ix_alerts_device_id", table_name="alerts")
+    op.drop_index("ix_training_jobs_created", table_name="training_jobs")
+    op.drop_index("ix_training_jobs_status_created", table_name="training_jobs")
+    op.drop_index("ix_tracking_mission_created", table_name="tracking_results")
+    op.drop_index("ix_det_ct", table_name="detection_results")
+    op.drop_index("ix_det_device_ct", table_name="detection_results")
+    op.drop_index("ix_det_mission_ct", table_name="detection_results")
+    op.drop_index("ix_missions_created", table_name="missions")
+    op.drop_index("ix_missions_status_created", table_name="missions")
+    op.drop_index("ix_missions_device_id", table_name="missions")
@@ -0,0 +1,42 @@
+"""json document columns to jsonb (PostgreSQL)
+
+JSONDoc columns are JSONB on PostgreSQL; convert the ones create_all made
+as json. No-op on SQLite, where both map to the same storage.
+
+Revision ID: c7e91f3a5b22
+Revises: 8f3b6d2e5a41
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e91f3a5b22"
+down_revision: Union[str, None] = "8f3b6d2e5a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = [
+    ("detection_results", "detections"),
+    ("alert_rules", "conditions"),
+    ("alerts", "metadata_json"),
+    ("training_jobs", "metrics"),
+]
+
+
+def _retype(new_type: str) -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {new_type} USING {column}::{new_type}")
+
+
+def upgrade() -> None:
+    _retype("jsonb")
+
+
+def downgrade() -> None:
+    _retype("json")
@@ -0,0 +1,54 @@
+"""point list columns to float8[] (PostgreSQL)
+
+Mission.waypoints and TrackingResult.trajectory use PointList, a 2-D
+float8 array on PostgreSQL. Existing json values ([[a, b], ...]) are
+converted row by row through a temporary SQL function, since ALTER ...
+USING can't contain a subquery. Rows must be rectangular (all points the
+same length), which MissionCreate has always produced for waypoints;
+SQL NULL and JSON null both become NULL.
+No-op on SQLite: PointList reads legacy JSON text there as-is.
+
+Revision ID: d5a0b8c4e637
+Revises: c7e91f3a5b22
+Create Date: 2026-10-16 09:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a0b8c4e637"
+down_revision: Union[str, None] = "c7e91f3a5b22"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = [("missions", "waypoints"), ("tracking_results", "trajectory")]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("""
+        CREATE FUNCTION pg_temp.json_points_to_float8(j json) RETURNS float8[]
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT COALESCE(
+                array_agg(ARRAY(SELECT e::float8 FROM json_array_elements_text(p) AS e) ORDER BY ord),
+                '{}'::float8[]
+            )
+            FROM json_array_elements(j) WITH ORDINALITY AS t(p, ord)
+        $$
+    """)
+    for table, column in _COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE float8[] "
+            f"USING CASE WHEN json_typeof({column}) = 'array' THEN pg_temp.json_points_to_float8({column}) END"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING array_to_json({column})")
@@ -0,0 +1,112 @@
+"""detection_boxes table, backfilled from detection_results.detections
+
+One row per detected box for SQL-side aggregation (stats class
+distribution). Existing results are expanded from their detections JSON
+in id-ordered batches. If the app's create_all already made the table,
+only results that still have no box rows are backfilled.
+
+Revision ID: e3f7a9c1d248
+Revises: d5a0b8c4e637
+Create Date: 2026-10-16 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f7a9c1d248"
+down_revision: Union[str, None] = "d5a0b8c4e637"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of app.models.detection_result.BOX_CONF_SCALE and the
+# api.detections._box_rows quantization, so this revision never drifts
+BOX_CONF_SCALE = 10_000
+BATCH = 1000
+
+_results = sa.table(
+    "detection_results",
+    sa.column("id", sa.Integer),
+    sa.column("detections", sa.JSON),
+)
+_boxes = sa.table(
+    "detection_boxes",
+    sa.column("id", sa.Integer),
+    sa.column("result_id", sa.Integer),
+    sa.column("class_id", sa.SmallInteger),
+    sa.column("class_name", sa.String),
+    sa.column("confidence", sa.SmallInteger),
+    sa.column("x1", sa.SmallInteger),
+    sa.column("y1", sa.SmallInteger),
+    sa.column("x2", sa.SmallInteger),
+    sa.column("y2", sa.SmallInteger),
+)
+
+
+def _px(v):
+    return None if v is None else max(-32768, min(32767, round(v)))
+
+
+def _box_rows(result_id: int, detections) -> list[dict]:
+    rows = []
+    for det in detections if isinstance(detections, list) else ():
+        if not isinstance(det, dict):
+            continue
+        conf = det.get("confidence")
+        rows.append({
+            "result_id": result_id,
+            "class_id": det.get("class_id"),
+            "class_name": det.get("class_name") or "unknown",
+            "confidence": None if conf is None else round(conf * BOX_CONF_SCALE),
+            **{k: _px(det.get(k)) for k in ("x1", "y1", "x2", "y2")},
+        })
+    return rows
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    has_boxes = sa.select(_boxes.c.id).where(_boxes.c.result_id == _results.c.id).exists()
+    last_id = 0
+    while True:
+        batch = bind.execute(
+            sa.select(_results.c.id, _results.c.detections)
+            .where(_results.c.id > last_id, _results.c.detections.isnot(None), ~has_boxes)
+            .order_by(_results.c.id)
+            .limit(BATCH)
+        ).all()
+        if not batch:
+            return
+        rows = [box for result_id, detections in batch for box in _box_rows(result_id, detections)]
+        if rows:
+            bind.execute(_boxes.insert(), rows)
+        last_id = batch[-1][0]
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("detection_boxes"):
+        op.create_table(
+            "detection_boxes",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("result_id", sa.Integer(), nullable=False),
+            sa.Column("class_id", sa.SmallInteger(), nullable=True),
+            sa.Column("class_name", sa.String(length=100), nullable=False),
+            sa.Column("confidence", sa.SmallInteger(), nullable=True),
+            sa.Column("x1", sa.SmallInteger(), nullable=True),
+            sa.Column("y1", sa.SmallInteger(), nullable=True),
+            sa.Column("x2", sa.SmallInteger(), nullable=True),
+            sa.Column("y2", sa.SmallInteger(), nullable=True),
+            sa.ForeignKeyConstraint(["result_id"], ["detection_results.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_boxes_result_class", "detection_boxes", ["result_id", "class_name"])
+        op.create_index("ix_boxes_class", "detection_boxes", ["class_name"])
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_boxes_class", table_name="detection_boxes")
+    op.drop_index("ix_boxes_result_class", table_name="detection_boxes")
+    op.drop_table("detection_boxes")
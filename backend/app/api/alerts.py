@@ -1,13 +1,16 @@
 """Alert management API endpoints."""
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from app.core.database import get_db
+from app.core.cache import cache_get, cache_set, cache_clear
+from app.core.database import get_db, count_and_fetch, newest_first_page
+from app.core.etag import etag_response
+from app.core.timeutils import utcnow
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.alert import AlertRule, Alert
@@ -26,13 +29,22 @@ router = APIRouter()
 async def list_rules(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: datetime | None = Query(None, description="Keyset cursor: created_at of the last item on the previous page"),
+    cursor_id: int | None = Query(None, description="Keyset cursor: id of the last item on the previous page"),
     db: AsyncSession = Depends(get_db),
+    count_db: AsyncSession = Depends(get_db, use_cache=False),
 ):
-    total = (await db.execute(select(func.count()).select_from(AlertRule))).scalar() or 0
-    result = await db.execute(
-        select(AlertRule).order_by(AlertRule.created_at.desc()).offset(skip).limit(limit)
+    query = select(*AlertRule.__table__.c)
+    query = newest_first_page(query, AlertRule, skip, cursor, cursor_id)
+    total, result = await count_and_fetch(
+        db, count_db,
+        select(func.count()).select_from(AlertRule),
+        query.limit(limit),
+        estimate_table=AlertRule.__tablename__,
     )
-    return AlertRuleListResponse(rules=result.scalars().all(), total=total)
+    # Rows come straight from Core — skip ORM hydration and re-validation
+    rules = [AlertRuleResponse.model_construct(**row) for row in result.mappings()]
+    return AlertRuleListResponse.model_construct(rules=rules, total=total)
 
 
 @router.post("/rules", response_model=AlertRuleResponse, status_code=status.HTTP_201_CREATED)
@@ -41,8 +53,6 @@ async def create_rule(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if data.trigger_type not in ("detection", "geofence", "battery", "signal", "custom"):
-        raise HTTPException(status_code=400, detail=f"不支持的触发类型: {data.trigger_type}")
     rule = AlertRule(
         name=data.name,
         description=data.description,
@@ -55,7 +65,6 @@ async def create_rule(
     )
     db.add(rule)
     await db.commit()
-    await db.refresh(rule)
     logger.info("Alert rule created: id=%d, type=%s", rule.id, rule.trigger_type)
     return rule
 
@@ -67,14 +76,12 @@ async def update_rule(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(AlertRule).where(AlertRule.id == rule_id))
-    rule = result.scalar_one_or_none()
+    rule = await db.get(AlertRule, rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="告警规则不存在")
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(rule, field, value)
     await db.commit()
-    await db.refresh(rule)
     return rule
 
 
@@ -84,8 +91,7 @@ async def delete_rule(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(AlertRule).where(AlertRule.id == rule_id))
-    rule = result.scalar_one_or_none()
+    rule = await db.get(AlertRule, rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="告警规则不存在")
     await db.delete(rule)
@@ -94,28 +100,25 @@ async def delete_rule(
 
 # ── Alerts ───────────────────────────────────────────────────
 
-@router.get("/stats", response_model=AlertStats)
-async def alert_stats(db: AsyncSession = Depends(get_db)):
-    total = (await db.execute(select(func.count()).select_from(Alert))).scalar() or 0
-    unack = (await db.execute(
-        select(func.count()).select_from(Alert).where(Alert.acknowledged == False)
-    )).scalar() or 0
-    critical = (await db.execute(
-        select(func.count()).select_from(Alert).where(Alert.severity == "critical")
-    )).scalar() or 0
-    warning = (await db.execute(
-        select(func.count()).select_from(Alert).where(Alert.severity == "warning")
-    )).scalar() or 0
-    info = (await db.execute(
-        select(func.count()).select_from(Alert).where(Alert.severity == "info")
-    )).scalar() or 0
-    resolved = (await db.execute(
-        select(func.count()).select_from(Alert).where(Alert.resolved == True)
-    )).scalar() or 0
-    return AlertStats(
-        total=total, unacknowledged=unack,
-        critical=critical, warning=warning, info=info, resolved=resolved,
-    )
+@router.api_route("/stats", methods=["GET", "HEAD"], response_model=AlertStats)
+async def alert_stats(request: Request, db: AsyncSession = Depends(get_db)):
+    cached = await cache_get("alerts", "stats")
+    if cached is not None:
+        return etag_response(request, cached)
+
+    # One aggregate scan instead of six COUNT round-trips
+    stmt = select(
+        func.count().label("total"),
+        func.count().filter(Alert.acknowledged.is_(False)).label("unacknowledged"),
+        func.count().filter(Alert.severity == "critical").label("critical"),
+        func.count().filter(Alert.severity == "warning").label("warning"),
+        func.count().filter(Alert.severity == "info").label("info"),
+        func.count().filter(Alert.resolved.is_(True)).label("resolved"),
+    ).select_from(Alert)
+    row = (await db.execute(stmt)).one()
+    stats = AlertStats(**row._mapping)
+    await cache_set("alerts", "stats", stats.model_dump(), expire=30)
+    return etag_response(request, stats)
 
 
 @router.get("/", response_model=AlertListResponse)
@@ -124,9 +127,12 @@ async def list_alerts(
     limit: int = Query(20, ge=1, le=100),
     severity: str | None = Query(None),
     acknowledged: bool | None = Query(None),
+    cursor: datetime | None = Query(None, description="Keyset cursor: created_at of the last item on the previous page"),
+    cursor_id: int | None = Query(None, description="Keyset cursor: id of the last item on the previous page"),
     db: AsyncSession = Depends(get_db),
+    count_db: AsyncSession = Depends(get_db, use_cache=False),
 ):
-    query = select(Alert).order_by(Alert.created_at.desc())
+    query = select(*Alert.__table__.c)
     count_query = select(func.count()).select_from(Alert)
 
     if severity:
@@ -136,9 +142,14 @@ async def list_alerts(
         query = query.where(Alert.acknowledged == acknowledged)
         count_query = count_query.where(Alert.acknowledged == acknowledged)
 
-    total = (await db.execute(count_query)).scalar() or 0
-    result = await db.execute(query.offset(skip).limit(limit))
-    return AlertListResponse(alerts=result.scalars().all(), total=total)
+    filtered = severity is not None or acknowledged is not None
+    query = newest_first_page(query, Alert, skip, cursor, cursor_id)
+    total, result = await count_and_fetch(
+        db, count_db, count_query, query.limit(limit),
+        estimate_table=None if filtered else Alert.__tablename__,
+    )
+    alerts = [AlertResponse.model_construct(**row) for row in result.mappings()]
+    return AlertListResponse.model_construct(alerts=alerts, total=total)
 
 
 @router.post("/", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
@@ -158,7 +169,7 @@ async def create_alert(
     )
     db.add(alert)
     await db.commit()
-    await db.refresh(alert)
+    await cache_clear("alerts")
     logger.info("Alert created: id=%d, severity=%s, title=%s", alert.id, alert.severity, alert.title)
     return alert
 
@@ -169,17 +180,16 @@ async def acknowledge_alert(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Alert).where(Alert.id == alert_id))
-    alert = result.scalar_one_or_none()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="告警不存在")
     if alert.acknowledged:
         raise HTTPException(status_code=400, detail="告警已确认")
     alert.acknowledged = True
     alert.acknowledged_by = current_user.id
-    alert.acknowledged_at = datetime.now(timezone.utc)
+    alert.acknowledged_at = utcnow()
     await db.commit()
-    await db.refresh(alert)
+    await cache_clear("alerts")
     return alert
 
 
@@ -189,20 +199,20 @@ async def resolve_alert(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Alert).where(Alert.id == alert_id))
-    alert = result.scalar_one_or_none()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="告警不存在")
     if alert.resolved:
         raise HTTPException(status_code=400, detail="告警已解决")
+    now = utcnow()
     alert.resolved = True
-    alert.resolved_at = datetime.now(timezone.utc)
+    alert.resolved_at = now
     if not alert.acknowledged:
         alert.acknowledged = True
         alert.acknowledged_by = current_user.id
-        alert.acknowledged_at = datetime.now(timezone.utc)
+        alert.acknowledged_at = now
     await db.commit()
-    await db.refresh(alert)
+    await cache_clear("alerts")
     return alert
 
 
@@ -212,9 +222,9 @@ async def delete_alert(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Alert).where(Alert.id == alert_id))
-    alert = result.scalar_one_or_none()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="告警不存在")
     await db.delete(alert)
     await db.commit()
+    await cache_clear("alerts")
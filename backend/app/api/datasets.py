@@ -1,10 +1,12 @@
 """Dataset management API endpoints."""
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from app.core.database import get_db
+from app.core.database import get_db, count_and_fetch, newest_first_page
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.dataset import Dataset
@@ -15,26 +17,33 @@ from app.schemas.dataset import (
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 64 * 1024  # bytes read per upload iteration
+
 
 @router.get("/", response_model=DatasetListResponse)
 async def list_datasets(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status_filter: str | None = Query(None, alias="status"),
+    cursor: datetime | None = Query(None, description="Keyset cursor: created_at of the last item on the previous page"),
+    cursor_id: int | None = Query(None, description="Keyset cursor: id of the last item on the previous page"),
     db: AsyncSession = Depends(get_db),
+    count_db: AsyncSession = Depends(get_db, use_cache=False),
 ):
-    query = select(Dataset).order_by(Dataset.created_at.desc())
+    query = select(*Dataset.__table__.c)
     if status_filter:
         query = query.where(Dataset.status == status_filter)
 
     count_query = select(func.count()).select_from(Dataset)
     if status_filter:
         count_query = count_query.where(Dataset.status == status_filter)
-    total = (await db.execute(count_query)).scalar() or 0
-
-    result = await db.execute(query.offset(skip).limit(limit))
-    datasets = result.scalars().all()
-    return DatasetListResponse(datasets=datasets, total=total)
+    query = newest_first_page(query, Dataset, skip, cursor, cursor_id)
+    total, result = await count_and_fetch(
+        db, count_db, count_query, query.limit(limit),
+        estimate_table=None if status_filter else Dataset.__tablename__,
+    )
+    datasets = [DatasetResponse.model_construct(**row) for row in result.mappings()]
+    return DatasetListResponse.model_construct(datasets=datasets, total=total)
 
 
 @router.post("/", response_model=DatasetResponse, status_code=status.HTTP_201_CREATED)
@@ -55,14 +64,12 @@ async def create_dataset(
     )
     db.add(dataset)
     await db.commit()
-    await db.refresh(dataset)
     return dataset
 
 
 @router.get("/{dataset_id}", response_model=DatasetResponse)
 async def get_dataset(dataset_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Dataset).where(Dataset.id == dataset_id))
-    dataset = result.scalar_one_or_none()
+    dataset = await db.get(Dataset, dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="数据集不存在")
     return dataset
@@ -75,8 +82,7 @@ async def update_dataset(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Dataset).where(Dataset.id == dataset_id))
-    dataset = result.scalar_one_or_none()
+    dataset = await db.get(Dataset, dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="数据集不存在")
 
@@ -87,7 +93,6 @@ async def update_dataset(
             setattr(dataset, field, value)
 
     await db.commit()
-    await db.refresh(dataset)
     return dataset
 
 
@@ -97,8 +102,7 @@ async def delete_dataset(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Dataset).where(Dataset.id == dataset_id))
-    dataset = result.scalar_one_or_none()
+    dataset = await db.get(Dataset, dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="数据集不存在")
     await db.delete(dataset)
@@ -113,21 +117,20 @@ async def upload_images(
     current_user: User = Depends(get_current_user),
 ):
     """Upload images to a dataset (placeholder — saves count only)."""
-    result = await db.execute(select(Dataset).where(Dataset.id == dataset_id))
-    dataset = result.scalar_one_or_none()
+    dataset = await db.get(Dataset, dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="数据集不存在")
 
     # In production: save files to MinIO, update storage_path
+    # (stream each chunk to put_object(..., length=-1) rather than buffering the file)
     total_size = 0
     for f in files:
-        content = await f.read()
-        total_size += len(content)
+        while chunk := await f.read(UPLOAD_CHUNK_SIZE):
+            total_size += len(chunk)
 
     dataset.num_images += len(files)
     dataset.size_mb = round(dataset.size_mb + total_size / (1024 * 1024), 2)
     dataset.status = "ready" if dataset.num_images > 0 else "draft"
 
     await db.commit()
-    await db.refresh(dataset)
     return dataset
@@ -1,28 +1,44 @@
-import io
 import time
-import uuid
-from datetime import datetime, timezone, timedelta
+from collections import Counter
+from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-
-from app.core.database import get_db
-from app.models.detection_result import DetectionResult
+from sqlalchemy import select, func, insert
+
+from app.core.cache import cache_get, cache_set, cache_clear
+from app.core.database import get_db, dialect_name, newest_first_page
+from app.core.ids import new_file_id, new_session_id
+from app.core.imaging import read_image_size
+from app.core.timeutils import utcnow
+from app.models.detection_result import BOX_CONF_SCALE, DetectionResult, DetectionBoxRow
 from app.schemas.detection import DetectionResultResponse, DetectionStats
 from app.services.detector import detector_service
 
 router = APIRouter()
 
+_COORD_FIELDS = ("x1", "y1", "x2", "y2")
+
+
+def _px(v: float | None) -> int | None:
+    """Whole-pixel coordinate clamped to the SMALLINT range."""
+    return None if v is None else max(-32768, min(32767, round(v)))
 
-def _read_image_size(image_bytes: bytes) -> tuple[int, int]:
-    """Try to read (width, height) from image bytes using PIL, fallback to (640, 480)."""
-    try:
-        from PIL import Image
-        img = Image.open(io.BytesIO(image_bytes))
-        return img.size  # (width, height)
-    except Exception:
-        return (640, 480)
+
+def _box_rows(result_id: int, detections: list[dict] | None) -> list[dict]:
+    """detection_boxes rows (quantized) for one result's detections list."""
+    rows = []
+    for det in detections or ():
+        conf = det.get("confidence")
+        row = {k: _px(det.get(k)) for k in _COORD_FIELDS}
+        row.update(
+            result_id=result_id,
+            class_id=det.get("class_id"),
+            class_name=det.get("class_name") or "unknown",
+            confidence=None if conf is None else round(conf * BOX_CONF_SCALE),
+        )
+        rows.append(row)
+    return rows
 
 
 @router.post("/image", response_model=DetectionResultResponse)
@@ -35,32 +51,38 @@ async def detect_image(
     db: AsyncSession = Depends(get_db),
 ):
     # Save uploaded file (placeholder — in production, save to MinIO)
-    file_id = uuid.uuid4().hex[:12]
+    file_id = new_file_id()
     image_path = f"uploads/detections/{file_id}_{file.filename}"
 
     # Read image bytes and dimensions
     image_bytes = await file.read()
-    img_w, img_h = _read_image_size(image_bytes)
+    img_w, img_h = await read_image_size(image_bytes)
 
     # Run YOLO inference (real model or mock fallback)
     t0 = time.perf_counter()
-    detections_list = detector_service.detect_image(
+    detections_list = await detector_service.detect_image_async(
         image_bytes, model_name, confidence, image_size=(img_w, img_h),
     )
     inference_ms = round((time.perf_counter() - t0) * 1000, 1)
 
-    result = DetectionResult(
-        mission_id=mission_id,
-        device_id=device_id,
-        image_path=image_path,
-        model_name=model_name,
-        detections=detections_list,
-        detection_count=len(detections_list),
-        inference_time_ms=inference_ms,
+    # Plain INSERT ... RETURNING, then one executemany for the boxes — no unit-of-work flush
+    result = await db.scalar(
+        insert(DetectionResult)
+        .values(
+            mission_id=mission_id,
+            device_id=device_id,
+            image_path=image_path,
+            model_name=model_name,
+            detections=detections_list,
+            detection_count=len(detections_list),
+            inference_time_ms=inference_ms,
+        )
+        .returning(DetectionResult)
     )
-    db.add(result)
+    if detections_list:
+        await db.execute(insert(DetectionBoxRow), _box_rows(result.id, detections_list))
     await db.commit()
-    await db.refresh(result)
+    await cache_clear("detections")
     return result
 
 
@@ -71,7 +93,7 @@ async def start_stream_detection(
     confidence: float = Query(0.5, ge=0.0, le=1.0),
 ):
     # TODO: Start real-time detection pipeline via background task
-    session_id = uuid.uuid4().hex[:8]
+    session_id = new_session_id()
     return {
         "session_id": session_id,
         "source": source,
@@ -103,19 +125,24 @@ async def list_detection_results(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     mission_id: int | None = Query(None),
+    device_id: int | None = Query(None),
+    cursor: datetime | None = Query(None, description="Keyset cursor: created_at of the last item on the previous page"),
+    cursor_id: int | None = Query(None, description="Keyset cursor: id of the last item on the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(DetectionResult).order_by(DetectionResult.created_at.desc())
+    query = select(*DetectionResult.__table__.c)
     if mission_id is not None:
         query = query.where(DetectionResult.mission_id == mission_id)
-    result = await db.execute(query.offset(skip).limit(limit))
-    return result.scalars().all()
+    if device_id is not None:
+        query = query.where(DetectionResult.device_id == device_id)
+    query = newest_first_page(query, DetectionResult, skip, cursor, cursor_id)
+    result = await db.execute(query.limit(limit))
+    return [DetectionResultResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.get("/results/{result_id}", response_model=DetectionResultResponse)
 async def get_detection_result(result_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(DetectionResult).where(DetectionResult.id == result_id))
-    det = result.scalar_one_or_none()
+    det = await db.get(DetectionResult, result_id)
     if not det:
         raise HTTPException(status_code=404, detail="检测结果不存在")
     return det
@@ -123,40 +150,66 @@ async def get_detection_result(result_id: int, db: AsyncSession = Depends(get_db
 
 @router.get("/stats", response_model=DetectionStats)
 async def get_detection_stats(db: AsyncSession = Depends(get_db)):
+    cached = await cache_get("detections", "stats")
+    if cached is not None:
+        return DetectionStats(**cached)
+
     # Total
     total = (await db.execute(select(func.count()).select_from(DetectionResult))).scalar() or 0
 
     # Today
-    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    today_start = utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     today_count = (await db.execute(
         select(func.count()).select_from(DetectionResult).where(DetectionResult.created_at >= today_start)
     )).scalar() or 0
 
-    # Class distribution (from recent 100 results)
-    recent = await db.execute(
-        select(DetectionResult).order_by(DetectionResult.created_at.desc()).limit(100)
+    # Class distribution (from recent 100 results) — indexed GROUP BY over detection_boxes
+    recent_ids = (
+        select(DetectionResult.id)
+        .order_by(DetectionResult.created_at.desc())
+        .limit(100)
+        .scalar_subquery()
+    )
+    rows = await db.execute(
+        select(DetectionBoxRow.class_name, func.count())
+        .where(DetectionBoxRow.result_id.in_(recent_ids))
+        .group_by(DetectionBoxRow.class_name)
+    )
+    counter: Counter[str] = Counter(dict(rows.all()))
+    # Results written before detection_boxes existed and not yet backfilled
+    # (alembic e3f7a9c1d248): count their detections JSON instead
+    legacy = await db.scalars(
+        select(DetectionResult.detections).where(
+            DetectionResult.id.in_(recent_ids),
+            DetectionResult.detection_count > 0,
+            ~select(DetectionBoxRow.id).where(DetectionBoxRow.result_id == DetectionResult.id).exists(),
+        )
     )
-    class_dist: dict[str, int] = {}
-    for r in recent.scalars().all():
-        if r.detections:
-            for det in r.detections:
-                cls = det.get("class_name", "unknown")
-                class_dist[cls] = class_dist.get(cls, 0) + 1
-
-    # Recent 7-day trend
+    for detections in legacy:
+        counter.update(det.get("class_name") or "unknown" for det in detections or ())
+    class_dist = dict(counter)
+
+    # Recent 7-day trend — one grouped query, missing days filled with 0
+    if dialect_name(db) == "postgresql":
+        day_col = func.to_char(func.timezone("UTC", DetectionResult.created_at), "YYYY-MM-DD")
+    else:
+        day_col = func.strftime("%Y-%m-%d", DetectionResult.created_at)
+    per_day = await db.execute(
+        select(day_col.label("day"), func.count())
+        .where(DetectionResult.created_at >= today_start - timedelta(days=6))
+        .group_by("day")
+    )
+    counts = dict(per_day.all())
     trend = []
     for i in range(6, -1, -1):
         day = today_start - timedelta(days=i)
-        next_day = day + timedelta(days=1)
-        count = (await db.execute(
-            select(func.count()).select_from(DetectionResult)
-            .where(DetectionResult.created_at >= day, DetectionResult.created_at < next_day)
-        )).scalar() or 0
-        trend.append({"date": day.strftime("%m-%d"), "count": count})
-
-    return DetectionStats(
+        trend.append({"date": day.strftime("%m-%d"), "count": counts.get(day.strftime("%Y-%m-%d"), 0)})
+
+    stats = DetectionStats(
         total_detections=total,
         today_detections=today_count,
         class_distribution=class_dist,
         recent_trend=trend,
     )
+    await cache_set("detections", "stats", stats.model_dump(), expire=60)
+    return stats
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db
+from app.core.etag import etag_response
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.device import Device
@@ -11,10 +13,10 @@ from app.schemas.device import DeviceCreate, DeviceUpdate, DeviceResponse
 router = APIRouter()
 
 
-@router.get("/", response_model=list[DeviceResponse])
-async def list_devices(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Device).order_by(Device.created_at.desc()))
-    return result.scalars().all()
+@router.api_route("/", methods=["GET", "HEAD"], response_model=list[DeviceResponse])
+async def list_devices(request: Request, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(*Device.__table__.c).order_by(Device.created_at.desc()))
+    return etag_response(request, [DeviceResponse.model_construct(**row) for row in result.mappings()])
 
 
 @router.post("/", response_model=DeviceResponse, status_code=status.HTTP_201_CREATED)
@@ -23,11 +25,6 @@ async def register_device(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Check duplicate serial number
-    result = await db.execute(select(Device).where(Device.serial_number == data.serial_number))
-    if result.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="设备序列号已存在")
-
     device = Device(
         name=data.name,
         device_type=data.device_type,
@@ -35,15 +32,18 @@ async def register_device(
         owner_id=current_user.id,
     )
     db.add(device)
-    await db.commit()
-    await db.refresh(device)
+    # Duplicate serial numbers are rejected by the unique index on serial_number
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="设备序列号已存在")
     return device
 
 
 @router.get("/{device_id}", response_model=DeviceResponse)
 async def get_device(device_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Device).where(Device.id == device_id))
-    device = result.scalar_one_or_none()
+    device = await db.get(Device, device_id)
     if not device:
         raise HTTPException(status_code=404, detail="设备不存在")
     return device
@@ -56,8 +56,7 @@ async def update_device(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Device).where(Device.id == device_id))
-    device = result.scalar_one_or_none()
+    device = await db.get(Device, device_id)
     if not device:
         raise HTTPException(status_code=404, detail="设备不存在")
 
@@ -65,7 +64,6 @@ async def update_device(
         setattr(device, field, value)
 
     await db.commit()
-    await db.refresh(device)
     return device
 
 
@@ -75,8 +73,7 @@ async def delete_device(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Device).where(Device.id == device_id))
-    device = result.scalar_one_or_none()
+    device = await db.get(Device, device_id)
     if not device:
         raise HTTPException(status_code=404, detail="设备不存在")
     await db.delete(device)
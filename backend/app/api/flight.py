@@ -124,8 +124,9 @@ async def get_telemetry(uav_id: str = Query(...)):
 @router.get("/status")
 async def flight_status():
     """Get flight controller service status."""
+    connections = flight_controller_service.list_connections()
     return {
         "mode": "real" if flight_controller_service.is_real_mode else "simulated",
-        "connected_uavs": len(flight_controller_service.list_connections()),
-        "connections": flight_controller_service.list_connections(),
+        "connected_uavs": len(connections),
+        "connections": connections,
     }
@@ -1,8 +1,9 @@
-from datetime import datetime, timezone
-
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete
+from sqlalchemy.orm import raiseload
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
@@ -12,6 +13,9 @@ from app.schemas.mission import MissionCreate, MissionUpdate, MissionResponse, M
 
 router = APIRouter()
 
+# One schema walk for the whole page instead of per-row model validation
+_MISSIONS_ADAPTER = TypeAdapter(list[MissionResponse])
+
 
 @router.get("/", response_model=MissionListResponse)
 async def list_missions(
@@ -20,19 +24,32 @@ async def list_missions(
     status_filter: str | None = Query(None, alias="status"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Mission).order_by(Mission.created_at.desc())
+    # COUNT(*) OVER () rides along with the page: one statement, one round-trip
+    # MissionResponse exposes only FK ids; raiseload makes any future relationship
+    # access fail fast instead of lazy-loading one row at a time
+    query = (
+        select(Mission, func.count().over().label("total"))
+        .options(raiseload("*"))
+        .order_by(Mission.created_at.desc())
+    )
     if status_filter:
         query = query.where(Mission.status == status_filter)
-
-    # Total count
-    count_query = select(func.count()).select_from(Mission)
-    if status_filter:
-        count_query = count_query.where(Mission.status == status_filter)
-    total = (await db.execute(count_query)).scalar() or 0
-
-    result = await db.execute(query.offset(skip).limit(limit))
-    missions = result.scalars().all()
-    return MissionListResponse(missions=missions, total=total)
+    rows = (await db.execute(query.offset(skip).limit(limit))).all()
+
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Past the last page there is no row to carry the window count
+        count_query = select(func.count()).select_from(Mission)
+        if status_filter:
+            count_query = count_query.where(Mission.status == status_filter)
+        total = await db.scalar(count_query) or 0
+    else:
+        total = 0
+    missions = _MISSIONS_ADAPTER.validate_python([r[0] for r in rows], from_attributes=True)
+    # Already validated: hand the dict straight to orjson rather than re-checking
+    # it against MissionListResponse (which still documents the shape in OpenAPI)
+    return ORJSONResponse({"missions": _MISSIONS_ADAPTER.dump_python(missions), "total": total})
 
 
 @router.post("/", response_model=MissionResponse, status_code=status.HTTP_201_CREATED)
@@ -52,14 +69,12 @@ async def create_mission(
     )
     db.add(mission)
     await db.commit()
-    await db.refresh(mission)
     return mission
 
 
 @router.get("/{mission_id}", response_model=MissionResponse)
 async def get_mission(mission_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Mission).where(Mission.id == mission_id))
-    mission = result.scalar_one_or_none()
+    mission = await db.get(Mission, mission_id, options=[raiseload("*")])
     if not mission:
         raise HTTPException(status_code=404, detail="任务不存在")
     return mission
@@ -72,8 +87,7 @@ async def update_mission(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Mission).where(Mission.id == mission_id))
-    mission = result.scalar_one_or_none()
+    mission = await db.get(Mission, mission_id)
     if not mission:
         raise HTTPException(status_code=404, detail="任务不存在")
 
@@ -81,7 +95,6 @@ async def update_mission(
         setattr(mission, field, value)
 
     await db.commit()
-    await db.refresh(mission)
     return mission
 
 
@@ -91,17 +104,20 @@ async def start_mission(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Mission).where(Mission.id == mission_id))
-    mission = result.scalar_one_or_none()
-    if not mission:
-        raise HTTPException(status_code=404, detail="任务不存在")
-    if mission.status not in ("pending", "paused"):
-        raise HTTPException(status_code=400, detail=f"任务状态为 {mission.status}，无法启动")
-
-    mission.status = "running"
-    mission.started_at = datetime.now(timezone.utc)
+    # Conditional UPDATE ... RETURNING: one round-trip on the success path
+    mission = (await db.execute(
+        update(Mission)
+        .where(Mission.id == mission_id, Mission.status.in_(("pending", "paused")))
+        .values(status="running", started_at=func.now())
+        .returning(Mission)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if mission is None:
+        current = await db.scalar(select(Mission.status).where(Mission.id == mission_id))
+        if current is None:
+            raise HTTPException(status_code=404, detail="任务不存在")
+        raise HTTPException(status_code=400, detail=f"任务状态为 {current}，无法启动")
     await db.commit()
-    await db.refresh(mission)
     return mission
 
 
@@ -111,17 +127,18 @@ async def stop_mission(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Mission).where(Mission.id == mission_id))
-    mission = result.scalar_one_or_none()
-    if not mission:
-        raise HTTPException(status_code=404, detail="任务不存在")
-    if mission.status != "running":
+    mission = (await db.execute(
+        update(Mission)
+        .where(Mission.id == mission_id, Mission.status == "running")
+        .values(status="completed", completed_at=func.now())
+        .returning(Mission)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if mission is None:
+        if await db.scalar(select(Mission.id).where(Mission.id == mission_id)) is None:
+            raise HTTPException(status_code=404, detail="任务不存在")
         raise HTTPException(status_code=400, detail="任务未在运行中")
-
-    mission.status = "completed"
-    mission.completed_at = datetime.now(timezone.utc)
     await db.commit()
-    await db.refresh(mission)
     return mission
 
 
@@ -131,9 +148,7 @@ async def delete_mission(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Mission).where(Mission.id == mission_id))
-    mission = result.scalar_one_or_none()
-    if not mission:
+    deleted = await db.scalar(delete(Mission).where(Mission.id == mission_id).returning(Mission.id))
+    if deleted is None:
         raise HTTPException(status_code=404, detail="任务不存在")
-    await db.delete(mission)
     await db.commit()
@@ -1,8 +1,10 @@
-import math
+import asyncio
 import time
-import random
 
-from fastapi import APIRouter, Query
+import numpy as np
+import orjson
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -32,58 +34,102 @@ class PlanResponse(BaseModel):
     planning_time_ms: float
 
 
-def _haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Calculate distance in meters between two GPS coordinates."""
-    R = 6371000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlam = math.radians(lng2 - lng1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+def _segment_distances(path: np.ndarray) -> np.ndarray:
+    """Great-circle length in meters of each leg of an (N, 2) [lat, lng] array, vectorized."""
+    if len(path) < 2:
+        return np.zeros(0)
+    lat = np.radians(path[:, 0])
+    lng = np.radians(path[:, 1])
+    dphi = np.diff(lat)
+    dlam = np.diff(lng)
+    a = np.sin(dphi / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlam / 2) ** 2
+    return 2 * 6371000 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
 
-def _interpolate_path(waypoints: list[list[float]], algorithm: str) -> list[list[float]]:
-    """Generate smooth path between waypoints with algorithm-specific behavior."""
-    if len(waypoints) < 2:
-        return waypoints
-
-    path: list[list[float]] = []
-    for i in range(len(waypoints) - 1):
-        a = waypoints[i]
-        b = waypoints[i + 1]
-        steps = 15
-
-        for s in range(steps + 1):
-            t = s / steps
-            # Different algorithms produce different path characteristics
-            if algorithm == "rrt_star":
-                # RRT* has slight randomness
-                jitter_lat = random.gauss(0, 0.00003)
-                jitter_lng = random.gauss(0, 0.00003)
-            elif algorithm == "ant_colony":
-                # Ant colony tends to curve
-                jitter_lat = math.sin(t * math.pi) * 0.0004
-                jitter_lng = math.cos(t * math.pi) * 0.0002
-            elif algorithm == "d_star_lite":
-                # D* Lite has sharper turns
-                jitter_lat = math.sin(t * math.pi * 2) * 0.0002
-                jitter_lng = 0
-            else:
-                # A* is smooth and direct
-                jitter_lat = math.sin(t * math.pi) * 0.0001
-                jitter_lng = math.sin(t * math.pi) * 0.0001
-
-            lat = a[0] + (b[0] - a[0]) * t + jitter_lat
-            lng = a[1] + (b[1] - a[1]) * t + jitter_lng
-            path.append([round(lat, 7), round(lng, 7)])
-
-    return path
+def _haversine_total(path: np.ndarray) -> float:
+    """Total great-circle length in meters of an (N, 2) [lat, lng] array."""
+    return float(_segment_distances(path).sum())
 
 
-@router.post("/generate", response_model=PlanResponse)
-async def generate_path(request: PlanRequest):
+# Samples per segment is fixed, so the quadratic Bernstein weights are too: shape (1, steps, 1)
+_BEZIER_STEPS = 15
+_t = np.linspace(0.0, 1.0, _BEZIER_STEPS, endpoint=False)[None, :, None]
+_B0, _B1, _B2 = (1 - _t) ** 2, 2 * _t * (1 - _t), _t ** 2
+del _t
+
+
+def _bezier_controls(pts: np.ndarray) -> np.ndarray:
+    """
+    Control point per segment for a smooth quadratic Bézier through the waypoints.
+
+    Tangent at each waypoint follows its neighbours (D_i = P_{i+1} - P_{i-1},
+    one-sided at the ends); the control point is where the tangent lines from
+    both segment endpoints intersect. Parallel or diverging tangents fall
+    back to the segment midpoint, i.e. a straight segment.
+    """
+    tangents = np.empty_like(pts)
+    tangents[1:-1] = pts[2:] - pts[:-2]
+    tangents[0] = pts[1] - pts[0]
+    tangents[-1] = pts[-1] - pts[-2]
+
+    p0, p1 = pts[:-1], pts[1:]
+    d0, d1 = tangents[:-1], tangents[1:]
+    chord = p1 - p0
+
+    # Solve p0 + s*d0 == p1 - u*d1 for (s, u) by Cramer's rule
+    det = d0[:, 0] * d1[:, 1] - d0[:, 1] * d1[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = (chord[:, 0] * d1[:, 1] - chord[:, 1] * d1[:, 0]) / det
+        u = (d0[:, 0] * chord[:, 1] - d0[:, 1] * chord[:, 0]) / det
+    ok = (np.abs(det) > 1e-18) & (s > 0) & (s < 1) & (u > 0) & (u < 1)
+
+    return np.where(ok[:, None], p0 + np.where(ok, s, 0)[:, None] * d0, (p0 + p1) / 2)
+
+
+def _interpolate_path(waypoints: list[list[float]]) -> np.ndarray:
+    """Sample a smooth Bézier path through the waypoints as an (M, 2) array."""
+    pts = np.asarray([wp[:2] for wp in waypoints], dtype=np.float64)
+    if len(pts) < 2:
+        return pts
+
+    p0, p1 = pts[:-1], pts[1:]
+    c = _bezier_controls(pts)
+
+    # gamma(t) = (1-t)^2 P0 + 2t(1-t) C + t^2 P1, evaluated for all segments at once
+    curve = _B0 * p0[:, None] + _B1 * c[:, None] + _B2 * p1[:, None]
+
+    path = np.concatenate((curve.reshape(-1, 2), pts[-1:]))
+    return np.round(path, 7)
+
+
+def _plan(request: PlanRequest) -> dict:
+    """
+    Pure, CPU-bound planning core; runs off the event loop.
+
+    The path stays an ndarray: ORJSONResponse serializes NumPy arrays
+    natively, so no per-point Python floats are ever built.
+    """
     start_time = time.perf_counter()
 
+    path = _interpolate_path(request.waypoints)
+
+    # Calculate total distance
+    total_dist = _haversine_total(path)
+
+    planning_time = (time.perf_counter() - start_time) * 1000
+
+    return {
+        "algorithm": request.algorithm,
+        "path": path,
+        "waypoints_count": len(request.waypoints),
+        "total_distance_m": round(total_dist, 2),
+        "estimated_time_s": round(total_dist / request.speed, 2),
+        "planning_time_ms": round(planning_time, 2),
+    }
+
+
+@router.post("/generate", response_model=PlanResponse)
+async def generate_path(request: PlanRequest):
     if len(request.waypoints) < 2:
         return PlanResponse(
             algorithm=request.algorithm,
@@ -94,36 +140,27 @@ async def generate_path(request: PlanRequest):
             planning_time_ms=0.0,
         )
 
-    path = _interpolate_path(request.waypoints, request.algorithm)
-
-    # Calculate total distance
-    total_dist = 0.0
-    for i in range(1, len(path)):
-        total_dist += _haversine(path[i - 1][0], path[i - 1][1], path[i][0], path[i][1])
+    # NumPy releases the GIL, so a worker thread keeps the loop responsive
+    plan = await asyncio.to_thread(_plan, request)
+    # response_model still documents the shape; orjson encodes the ndarray path directly
+    return ORJSONResponse(plan)
 
-    planning_time = (time.perf_counter() - start_time) * 1000
 
-    return PlanResponse(
-        algorithm=request.algorithm,
-        path=path,
-        waypoints_count=len(request.waypoints),
-        total_distance_m=round(total_dist, 2),
-        estimated_time_s=round(total_dist / request.speed, 2),
-        planning_time_ms=round(planning_time, 2),
-    )
+# Static catalogue, serialized once at import; handlers just copy the bytes
+_ALGORITHMS_BODY = orjson.dumps({
+    "algorithms": [
+        {"id": "a_star", "name": "A* 算法", "type": "global", "description": "全局最优，适合静态环境"},
+        {"id": "rrt_star", "name": "RRT* 算法", "type": "sampling", "description": "采样规划，适合复杂空间"},
+        {"id": "ant_colony", "name": "改进蚁群算法", "type": "optimization", "description": "多航点顺序优化"},
+        {"id": "d_star_lite", "name": "D* Lite", "type": "dynamic", "description": "动态避障，增量重规划"},
+        {"id": "coverage", "name": "区域覆盖规划", "type": "coverage", "description": "牛耕式全覆盖扫描"},
+    ]
+})
 
 
 @router.get("/algorithms")
 async def list_algorithms():
-    return {
-        "algorithms": [
-            {"id": "a_star", "name": "A* 算法", "type": "global", "description": "全局最优，适合静态环境"},
-            {"id": "rrt_star", "name": "RRT* 算法", "type": "sampling", "description": "采样规划，适合复杂空间"},
-            {"id": "ant_colony", "name": "改进蚁群算法", "type": "optimization", "description": "多航点顺序优化"},
-            {"id": "d_star_lite", "name": "D* Lite", "type": "dynamic", "description": "动态避障，增量重规划"},
-            {"id": "coverage", "name": "区域覆盖规划", "type": "coverage", "description": "牛耕式全覆盖扫描"},
-        ]
-    }
+    return Response(content=_ALGORITHMS_BODY, media_type="application/json")
 
 
 @router.post("/validate")
@@ -146,12 +183,13 @@ async def validate_path(
         errors.append(f"飞行高度 {altitude}m 超过最高限制 {max_altitude}m")
 
     # Check total distance
-    total_dist = 0.0
-    for i in range(1, len(waypoints)):
-        total_dist += _haversine(waypoints[i - 1][0], waypoints[i - 1][1], waypoints[i][0], waypoints[i][1])
+    # Cumulative distance per waypoint; also locates where the limit is first crossed
+    cum = np.cumsum(_segment_distances(np.asarray([wp[:2] for wp in waypoints], dtype=np.float64)))
+    total_dist = float(cum[-1]) if len(cum) else 0.0
 
     if total_dist > max_distance_m:
-        errors.append(f"总航程 {total_dist:.0f}m 超过最大限制 {max_distance_m:.0f}m")
+        over_at = int(np.searchsorted(cum, max_distance_m, side="right")) + 2  # 1-based waypoint index
+        errors.append(f"总航程 {total_dist:.0f}m 超过最大限制 {max_distance_m:.0f}m（第 {over_at} 个航点处超限）")
 
     return {
         "valid": len(errors) == 0,
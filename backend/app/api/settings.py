@@ -2,13 +2,19 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from typing import Optional
 
-from app.core.deps import get_current_user
+from app.core.cache import get_redis
+from app.core.deps import get_current_user, get_current_user_id
+from app.core.state_store import state_get, state_put
 from app.models.user import User
 
 router = APIRouter()
 
-# In-memory settings store (per-user). In production, persist to DB.
-_user_settings: dict[int, dict] = {}
+# Per-user settings live in Redis so every worker sees the same values.
+# Without Redis (single-worker dev) validated instances are kept in-process,
+# replaced (never mutated) on update.
+_user_settings: dict[int, "UserSettings"] = {}
+# With Redis: user_id -> (stored mapping, instance validated from it), per worker
+_validated: dict[int, tuple[dict, "UserSettings"]] = {}
 
 
 class UserSettings(BaseModel):
@@ -36,10 +42,36 @@ class UserSettingsUpdate(BaseModel):
     safety_distance: Optional[float] = None
 
 
+_DEFAULT_SETTINGS = UserSettings()
+
+
+async def _load_settings(user_id: int) -> UserSettings:
+    if get_redis() is None:
+        return _user_settings.get(user_id, _DEFAULT_SETTINGS)
+    stored = await state_get("user-settings", str(user_id))
+    if not stored:
+        return _DEFAULT_SETTINGS
+    # Re-validate only when the shared value changed since this worker last saw it
+    cached = _validated.get(user_id)
+    if cached is not None and cached[0] == stored:
+        return cached[1]
+    settings = UserSettings(**stored)
+    _validated[user_id] = (stored, settings)
+    return settings
+
+
+async def _save_settings(user_id: int, settings: UserSettings) -> None:
+    if get_redis() is None:
+        _user_settings[user_id] = settings
+        return
+    stored = settings.model_dump()
+    await state_put("user-settings", str(user_id), stored)
+    _validated[user_id] = (stored, settings)
+
+
 @router.get("/", response_model=UserSettings)
-async def get_settings(current_user: User = Depends(get_current_user)):
-    stored = _user_settings.get(current_user.id, {})
-    return UserSettings(**stored)
+async def get_settings(user_id: int = Depends(get_current_user_id)):
+    return await _load_settings(user_id)
 
 
 @router.put("/", response_model=UserSettings)
@@ -47,8 +79,8 @@ async def update_settings(
     data: UserSettingsUpdate,
     current_user: User = Depends(get_current_user),
 ):
-    stored = _user_settings.get(current_user.id, {})
-    updates = data.model_dump(exclude_none=True)
-    stored.update(updates)
-    _user_settings[current_user.id] = stored
-    return UserSettings(**stored)
+    # Writes go through get_current_user so a disabled or deleted account is refused
+    stored = await _load_settings(current_user.id)
+    updated = stored.model_copy(update=data.model_dump(exclude_none=True))
+    await _save_settings(current_user.id, updated)
+    return updated
@@ -1,13 +1,16 @@
 import time
-import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from PIL import Image
-import io
+from sqlalchemy import select, insert
 
 from app.core.database import get_db
+from app.core.ids import new_session_id
+from app.core.imaging import read_image_size
+from app.core.state_store import state_put, state_values
 from app.models.detection_result import TrackingResult
 from app.schemas.tracking import TrackResponse, TrackingSession, TrackFrameResponse
 from app.services.tracker import tracker_service
@@ -15,6 +18,12 @@ from app.services.detector import detector_service
 
 router = APIRouter()
 
+# Session metadata is shared through Redis so any worker can list it. Live
+# tracker state (Kalman filters, appearance features) stays in the owning
+# worker, so /frame and /stop need sticky routing by session_id.
+_SESSION_NS = "tracking-session"
+_SESSION_TTL = 3600
+
 
 @router.post("/start", response_model=TrackingSession)
 async def start_tracking(
@@ -27,8 +36,9 @@ async def start_tracking(
     if tracker_type not in supported_ids:
         raise HTTPException(status_code=400, detail=f"不支持的跟踪器类型: {tracker_type}")
 
-    session_id = uuid.uuid4().hex[:8]
+    session_id = new_session_id()
     session = tracker_service.create_session(session_id, tracker_type, source)
+    await state_put(_SESSION_NS, session_id, session.to_dict(), expire=_SESSION_TTL)
 
     return TrackingSession(
         session_id=session.session_id,
@@ -51,21 +61,23 @@ async def stop_tracking(
     if not session:
         raise HTTPException(status_code=404, detail="跟踪会话不存在")
 
-    # Save track summaries to DB before stopping
-    summaries = session.get_track_summaries()
-    for s in summaries:
-        tr = TrackingResult(
-            tracker_type=session.tracker_type,
-            track_id=s["track_id"],
-            class_name=s["class_name"],
-            trajectory=s["trajectory"],
-            total_frames=s["total_frames"],
-        )
-        db.add(tr)
-    if summaries:
+    # Save track summaries to DB before stopping — one batched ORM bulk INSERT
+    rows = [
+        {
+            "tracker_type": session.tracker_type,
+            "track_id": s["track_id"],
+            "class_name": s["class_name"],
+            "trajectory": s["trajectory"],
+            "total_frames": s["total_frames"],
+        }
+        for s in session.get_track_summaries()
+    ]
+    if rows:
+        await db.execute(insert(TrackingResult), rows)
         await db.commit()
 
     tracker_service.stop_session(session_id)
+    await state_put(_SESSION_NS, session_id, session.to_dict(), expire=_SESSION_TTL)
 
     return TrackingSession(
         session_id=session.session_id,
@@ -81,13 +93,20 @@ async def stop_tracking(
 
 @router.get("/sessions")
 async def list_sessions():
-    return {"sessions": tracker_service.list_sessions()}
+    sessions = {s["session_id"]: s for s in await state_values(_SESSION_NS)}
+    # This worker's own sessions carry live counters; prefer them over the shared snapshot
+    sessions.update((s["session_id"], s) for s in tracker_service.list_sessions())
+    return {"sessions": list(sessions.values())}
+
+
+# Tracker availability is fixed at import time, so the payload is too
+_TRACKERS_BODY = orjson.dumps({"trackers": tracker_service.supported_trackers})
 
 
 @router.get("/trackers")
 async def list_trackers():
     """List supported tracker types and their availability."""
-    return {"trackers": tracker_service.supported_trackers}
+    return Response(content=_TRACKERS_BODY, media_type="application/json")
 
 
 @router.post("/frame", response_model=TrackFrameResponse)
@@ -103,18 +122,16 @@ async def track_frame(
         raise HTTPException(status_code=404, detail="跟踪会话不存在或已停止")
 
     t0 = time.perf_counter()
-    image_bytes = await file.read()
+    # Hand the spooled upload file straight to the detector instead of copying it into bytes
+    image = file.file
+    await file.seek(0)
 
-    # Get image dimensions
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-        img_w, img_h = img.size
-    except Exception:
-        img_w, img_h = 640, 480
+    # Get image dimensions from the header (no pixel decode)
+    img_w, img_h = await read_image_size(image)
 
     # Run detection
-    detections = detector_service.detect_image(
-        image_bytes, model_name, confidence, image_size=(img_w, img_h)
+    detections = await detector_service.detect_image_async(
+        image, model_name, confidence, image_size=(img_w, img_h)
     )
 
     # Run tracking
@@ -122,13 +139,15 @@ async def track_frame(
 
     inference_ms = round((time.perf_counter() - t0) * 1000, 1)
 
-    return TrackFrameResponse(
-        session_id=session_id,
-        tracked_objects=tracked,
-        active_tracks=session.active_tracks,
-        total_tracks=session.total_tracks,
-        inference_time_ms=inference_ms,
-    )
+    # Hot per-frame path: the tracker already emits TrackFrameResponse-shaped
+    # plain dicts, so encode them directly instead of building a model per object
+    return ORJSONResponse({
+        "session_id": session_id,
+        "tracked_objects": tracked,
+        "active_tracks": session.active_tracks,
+        "total_tracks": session.total_tracks,
+        "inference_time_ms": inference_ms,
+    })
 
 
 @router.get("/tracks", response_model=list[TrackResponse])
@@ -147,8 +166,7 @@ async def list_tracks(
 
 @router.get("/tracks/{track_id}", response_model=TrackResponse)
 async def get_track(track_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(TrackingResult).where(TrackingResult.id == track_id))
-    track = result.scalar_one_or_none()
+    track = await db.get(TrackingResult, track_id)
     if not track:
         raise HTTPException(status_code=404, detail="跟踪记录不存在")
     return track
@@ -156,8 +174,7 @@ async def get_track(track_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.get("/tracks/{track_id}/trajectory")
 async def get_trajectory(track_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(TrackingResult).where(TrackingResult.id == track_id))
-    track = result.scalar_one_or_none()
+    track = await db.get(TrackingResult, track_id)
     if not track:
         raise HTTPException(status_code=404, detail="跟踪记录不存在")
     return {
@@ -1,13 +1,13 @@
 """Training job management API endpoints."""
 
 import logging
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, bindparam
 
 from app.core.database import get_db
+from app.core.timeutils import utcnow
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.dataset import Dataset, TrainingJob
@@ -18,6 +18,14 @@ from app.schemas.dataset import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Built once; only the bound id changes per call (hits the compiled-SQL cache directly)
+_JOB_STATUS_STMT = select(TrainingJob.status).where(TrainingJob.id == bindparam("job_id"))
+
+
+async def _job_status(db: AsyncSession, job_id: int) -> str | None:
+    """Current status of a job, or None if it doesn't exist (error-path probe)."""
+    return await db.scalar(_JOB_STATUS_STMT, {"job_id": job_id})
+
 
 @router.get("/", response_model=TrainingJobListResponse)
 async def list_training_jobs(
@@ -26,18 +34,23 @@ async def list_training_jobs(
     status_filter: str | None = Query(None, alias="status"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(TrainingJob).order_by(TrainingJob.created_at.desc())
+    # COUNT(*) OVER () rides along with the page: one statement, one round-trip
+    query = select(TrainingJob, func.count().over().label("total")).order_by(TrainingJob.created_at.desc())
     if status_filter:
         query = query.where(TrainingJob.status == status_filter)
+    rows = (await db.execute(query.offset(skip).limit(limit))).all()
 
-    count_query = select(func.count()).select_from(TrainingJob)
-    if status_filter:
-        count_query = count_query.where(TrainingJob.status == status_filter)
-    total = (await db.execute(count_query)).scalar() or 0
-
-    result = await db.execute(query.offset(skip).limit(limit))
-    jobs = result.scalars().all()
-    return TrainingJobListResponse(jobs=jobs, total=total)
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Past the last page there is no row to carry the window count
+        count_query = select(func.count()).select_from(TrainingJob)
+        if status_filter:
+            count_query = count_query.where(TrainingJob.status == status_filter)
+        total = await db.scalar(count_query) or 0
+    else:
+        total = 0
+    return TrainingJobListResponse(jobs=[r[0] for r in rows], total=total)
 
 
 @router.post("/", response_model=TrainingJobResponse, status_code=status.HTTP_201_CREATED)
@@ -47,8 +60,7 @@ async def create_training_job(
     current_user: User = Depends(get_current_user),
 ):
     # Verify dataset exists
-    ds_result = await db.execute(select(Dataset).where(Dataset.id == data.dataset_id))
-    dataset = ds_result.scalar_one_or_none()
+    dataset = await db.get(Dataset, data.dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="数据集不存在")
     if dataset.status != "ready":
@@ -67,15 +79,13 @@ async def create_training_job(
     )
     db.add(job)
     await db.commit()
-    await db.refresh(job)
     logger.info("Training job created: id=%d, model=%s, dataset=%d", job.id, job.base_model, job.dataset_id)
     return job
 
 
 @router.get("/{job_id}", response_model=TrainingJobResponse)
 async def get_training_job(job_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(TrainingJob).where(TrainingJob.id == job_id))
-    job = result.scalar_one_or_none()
+    job = await db.get(TrainingJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="训练任务不存在")
     return job
@@ -87,23 +97,22 @@ async def start_training_job(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(TrainingJob).where(TrainingJob.id == job_id))
-    job = result.scalar_one_or_none()
-    if not job:
-        raise HTTPException(status_code=404, detail="训练任务不存在")
-    if job.status not in ("pending", "failed"):
-        raise HTTPException(status_code=400, detail=f"任务状态为 {job.status}，无法启动")
-
     # In production: launch actual training via Celery/subprocess
-    # For now: simulate start
-    job.status = "running"
-    job.started_at = datetime.now(timezone.utc)
-    job.progress = 0.0
-    job.current_epoch = 0
-    job.error_message = None
+    # For now: simulate start. Conditional UPDATE ... RETURNING is one round-trip.
+    job = (await db.execute(
+        update(TrainingJob)
+        .where(TrainingJob.id == job_id, TrainingJob.status.in_(("pending", "failed")))
+        .values(status="running", started_at=func.now(), progress=0.0, current_epoch=0, error_message=None)
+        .returning(TrainingJob)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if job is None:
+        current = await _job_status(db, job_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="训练任务不存在")
+        raise HTTPException(status_code=400, detail=f"任务状态为 {current}，无法启动")
 
     await db.commit()
-    await db.refresh(job)
     logger.info("Training job started: id=%d", job.id)
     return job
 
@@ -114,19 +123,19 @@ async def stop_training_job(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(TrainingJob).where(TrainingJob.id == job_id))
-    job = result.scalar_one_or_none()
-    if not job:
-        raise HTTPException(status_code=404, detail="训练任务不存在")
-    if job.status != "running":
+    job = (await db.execute(
+        update(TrainingJob)
+        .where(TrainingJob.id == job_id, TrainingJob.status == "running")
+        .values(status="failed", error_message="用户手动停止", completed_at=func.now())
+        .returning(TrainingJob)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if job is None:
+        if await _job_status(db, job_id) is None:
+            raise HTTPException(status_code=404, detail="训练任务不存在")
         raise HTTPException(status_code=400, detail="任务未在运行中")
 
-    job.status = "failed"
-    job.error_message = "用户手动停止"
-    job.completed_at = datetime.now(timezone.utc)
-
     await db.commit()
-    await db.refresh(job)
     logger.info("Training job stopped: id=%d", job.id)
     return job
 
@@ -137,8 +146,7 @@ async def simulate_progress(
     db: AsyncSession = Depends(get_db),
 ):
     """Dev-only: simulate training progress by advancing epochs."""
-    result = await db.execute(select(TrainingJob).where(TrainingJob.id == job_id))
-    job = result.scalar_one_or_none()
+    job = await db.get(TrainingJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="训练任务不存在")
     if job.status != "running":
@@ -160,11 +168,10 @@ async def simulate_progress(
 
     if job.current_epoch >= job.epochs:
         job.status = "completed"
-        job.completed_at = datetime.now(timezone.utc)
+        job.completed_at = utcnow()
         job.output_model_path = f"weights/train_{job.id}_best.pt"
 
     await db.commit()
-    await db.refresh(job)
     return job
 
 
@@ -174,11 +181,13 @@ async def delete_training_job(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(TrainingJob).where(TrainingJob.id == job_id))
-    job = result.scalar_one_or_none()
-    if not job:
-        raise HTTPException(status_code=404, detail="训练任务不存在")
-    if job.status == "running":
+    deleted = await db.scalar(
+        delete(TrainingJob)
+        .where(TrainingJob.id == job_id, TrainingJob.status != "running")
+        .returning(TrainingJob.id)
+    )
+    if deleted is None:
+        if await _job_status(db, job_id) is None:
+            raise HTTPException(status_code=404, detail="训练任务不存在")
         raise HTTPException(status_code=400, detail="运行中的任务无法删除")
-    await db.delete(job)
     await db.commit()
@@ -1,45 +1,99 @@
 import asyncio
-import json
+import logging
 import math
 import random
 import time
-from datetime import datetime, timezone
+from datetime import datetime
+from typing import Callable
 
+import numpy as np
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.core.timeutils import utcnow
 from app.services.flight_controller import flight_controller_service
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Subscribers sent to concurrently per broadcast batch
+_BROADCAST_BATCH = 50
+
+# A subscriber whose send doesn't drain within this long is dropped, so one
+# slow client can't hold up a broadcast batch (seconds)
+_SEND_TIMEOUT_S = 5.0
+
+# Frames buffered per streaming connection before the client counts as too slow
+_SEND_QUEUE_MAX = 100
+
+# ws_dashboard push interval (seconds)
+_DASHBOARD_TICK_S = 2.0
+
+# Flight controller telemetry fields forwarded as-is to the dashboard
+_TELEMETRY_FIELDS = ("latitude", "longitude", "altitude", "speed", "heading", "battery", "flight_mode")
+# Simulated [satellites, signal_strength] ranges (exclusive upper bounds)
+_LINK_LOW = (10, -70)
+_LINK_HIGH = (17, -54)
+
+
+def _encode(data: dict) -> bytes:
+    """Serialize a WebSocket frame once; datetimes are emitted as ISO 8601 by orjson."""
+    return orjson.dumps(data)
+
+
+async def _close_quietly(websocket: WebSocket):
+    try:
+        await asyncio.wait_for(websocket.close(code=1013), 1.0)  # 1013: try again later
+    except Exception:
+        pass
+
 
 class ConnectionManager:
     """Manage WebSocket connections by channel."""
 
     def __init__(self):
-        self.active_connections: dict[str, list[WebSocket]] = {}
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        # Guards structural changes only; never held while sending
+        self._lock = asyncio.Lock()
 
     async def connect(self, websocket: WebSocket, channel: str):
         await websocket.accept()
-        if channel not in self.active_connections:
-            self.active_connections[channel] = []
-        self.active_connections[channel].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, channel: str):
-        if channel in self.active_connections:
-            self.active_connections[channel] = [
-                ws for ws in self.active_connections[channel] if ws != websocket
-            ]
-            if not self.active_connections[channel]:
+        async with self._lock:
+            self.active_connections.setdefault(channel, set()).add(websocket)
+
+    async def disconnect(self, websocket: WebSocket, channel: str):
+        async with self._lock:
+            self._remove(websocket, channel)
+
+    def _remove(self, websocket: WebSocket, channel: str):
+        conns = self.active_connections.get(channel)
+        if conns is not None:
+            conns.discard(websocket)
+            if not conns:
                 del self.active_connections[channel]
 
     async def broadcast(self, channel: str, data: dict):
-        if channel in self.active_connections:
-            message = json.dumps(data, ensure_ascii=False)
-            for ws in self.active_connections[channel]:
-                try:
-                    await ws.send_text(message)
-                except Exception:
-                    pass
+        async with self._lock:
+            conns = tuple(self.active_connections.get(channel, ()))
+        if not conns:
+            return
+        message = _encode(data)
+        dead: list[WebSocket] = []
+        for i in range(0, len(conns), _BROADCAST_BATCH):
+            if i:
+                await asyncio.sleep(0)  # let other tasks run between batches
+            batch = conns[i:i + _BROADCAST_BATCH]
+            results = await asyncio.gather(
+                *(asyncio.wait_for(ws.send_bytes(message), _SEND_TIMEOUT_S) for ws in batch),
+                return_exceptions=True,
+            )
+            dead.extend(ws for ws, r in zip(batch, results) if isinstance(r, Exception))
+        if dead:
+            async with self._lock:
+                for ws in dead:
+                    self._remove(ws, channel)
+            # A timed-out send may have left a partial frame; close so the client reconnects
+            await asyncio.gather(*(_close_quietly(ws) for ws in dead))
 
     @property
     def connection_count(self) -> int:
@@ -60,7 +114,7 @@ def _generate_telemetry(uav_id: str, step: int) -> dict:
     return {
         "type": "telemetry",
         "uav_id": uav_id,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utcnow(),
         "data": {
             "latitude": base_lat + radius * math.sin(angle),
             "longitude": base_lng + radius * math.cos(angle),
@@ -75,135 +129,185 @@ def _generate_telemetry(uav_id: str, step: int) -> dict:
     }
 
 
-def _generate_detection_event(step: int) -> dict:
+_DETECTION_CLASSES = np.array(["drone", "bird", "airplane", "helicopter", "unknown"])
+_BBOX_LOW = np.array([50, 50, 100, 100])
+_BBOX_HIGH = np.array([401, 301, 201, 201])  # exclusive upper bounds
+_rng = np.random.default_rng()
+
+
+def _generate_detection_event(step: int, ts: datetime | None = None) -> dict:
     """Generate simulated detection event."""
-    classes = ["drone", "bird", "airplane", "helicopter", "unknown"]
+    n = int(_rng.integers(0, 4))
+    bboxes = _rng.integers(_BBOX_LOW, _BBOX_HIGH, size=(n, 4)).tolist()
+    confidences = _rng.uniform(0.5, 0.99, n).round(2).tolist()
+    class_names = _rng.choice(_DETECTION_CLASSES, n).tolist()
     return {
         "type": "detection",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": ts or utcnow(),
         "frame_number": step,
         "detections": [
-            {
-                "class_name": random.choice(classes),
-                "confidence": round(random.uniform(0.5, 0.99), 2),
-                "bbox": [
-                    random.randint(50, 400),
-                    random.randint(50, 300),
-                    random.randint(100, 200),
-                    random.randint(100, 200),
-                ],
-            }
-            for _ in range(random.randint(0, 3))
+            {"class_name": c, "confidence": conf, "bbox": bbox}
+            for c, conf, bbox in zip(class_names, confidences, bboxes)
         ],
     }
 
 
-def _generate_alert() -> dict | None:
+_ALERTS = (
+    ("warning", "UAV-01 电量低于 30%"),
+    ("info", "检测到新目标进入监控区域"),
+    ("warning", "UAV-02 信号强度下降"),
+    ("error", "UAV-03 通信中断"),
+    ("info", "任务 M-005 已完成"),
+)
+
+
+def _generate_alert(ts: datetime | None = None) -> dict | None:
     """Occasionally generate a system alert."""
-    if random.random() > 0.1:
+    if random.random() >= 0.1:
         return None
-    alerts = [
-        {"level": "warning", "message": "UAV-01 电量低于 30%"},
-        {"level": "info", "message": "检测到新目标进入监控区域"},
-        {"level": "warning", "message": "UAV-02 信号强度下降"},
-        {"level": "error", "message": "UAV-03 通信中断"},
-        {"level": "info", "message": "任务 M-005 已完成"},
-    ]
-    alert = random.choice(alerts)
-    alert["type"] = "alert"
-    alert["timestamp"] = datetime.now(timezone.utc).isoformat()
-    return alert
+    level, message = _ALERTS[random.randrange(len(_ALERTS))]
+    return {
+        "level": level,
+        "message": message,
+        "type": "alert",
+        "timestamp": ts or utcnow(),
+    }
 
 
 # ── WebSocket Endpoints ────────────────────────────────────────────
 
-@router.websocket("/telemetry/{uav_id}")
-async def ws_telemetry(websocket: WebSocket, uav_id: str):
-    """Stream real-time telemetry data for a specific UAV."""
-    await manager.connect(websocket, f"telemetry:{uav_id}")
+async def _drain(websocket: WebSocket, queue: asyncio.Queue):
+    """Writer task: send queued frames in order until the socket fails."""
+    while True:
+        frame = await queue.get()
+        await websocket.send_bytes(frame)
+
+
+async def _stream(websocket: WebSocket, channel: str, make_frame: Callable[[int], dict], interval: float):
+    """
+    Produce one frame per interval into a bounded per-connection queue drained by a writer task.
+
+    The producer keeps its cadence while sends are slow; a client that lets
+    the queue fill up is closed instead of buffering without bound.
+    """
+    await manager.connect(websocket, channel)
+    queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=_SEND_QUEUE_MAX)
+    writer = asyncio.create_task(_drain(websocket, queue))
     step = 0
     try:
-        while True:
-            data = _generate_telemetry(uav_id, step)
-            await websocket.send_text(json.dumps(data, ensure_ascii=False))
+        while not writer.done():  # writer exits when the client disconnects
+            try:
+                queue.put_nowait(_encode(make_frame(step)))
+            except asyncio.QueueFull:
+                logger.warning("WebSocket client on %s too slow, disconnecting", channel)
+                await _close_quietly(websocket)
+                break
             step += 1
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, f"telemetry:{uav_id}")
+            await asyncio.sleep(interval)
+    finally:
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        await manager.disconnect(websocket, channel)
+
+
+@router.websocket("/telemetry/{uav_id}")
+async def ws_telemetry(websocket: WebSocket, uav_id: str):
+    """Stream real-time telemetry data for a specific UAV."""
+    await _stream(websocket, f"telemetry:{uav_id}", lambda step: _generate_telemetry(uav_id, step), 1.0)
 
 
 @router.websocket("/detection/{session_id}")
 async def ws_detection(websocket: WebSocket, session_id: str):
     """Stream real-time detection results for a detection session."""
-    await manager.connect(websocket, f"detection:{session_id}")
+    await _stream(websocket, f"detection:{session_id}", _generate_detection_event, 0.5)
+
+
+def _dashboard_items(step: int) -> list[dict]:
+    """Build one dashboard tick: telemetry per connected UAV, detection, alert, stats."""
+    # Only send telemetry for UAVs that are connected via flight controller
+    connections = flight_controller_service.list_connections()
+    now = utcnow()
+    items: list[dict] = []
+
+    # One RNG call per tick for every UAV's simulated link quality
+    link = _rng.integers(_LINK_LOW, _LINK_HIGH, size=(len(connections), 2)).tolist()
+    for tel, (satellites, signal) in zip(connections, link):
+        data = {k: tel[k] for k in _TELEMETRY_FIELDS}
+        data["satellites"] = satellites
+        data["signal_strength"] = signal
+        data["mission_waypoints"] = tel.get("mission_waypoints", [])
+        items.append({"type": "telemetry", "uav_id": tel["uav_id"], "timestamp": now, "data": data})
+
+    # Occasionally send detection events
+    if step % 3 == 0:
+        items.append(_generate_detection_event(step, now))
+
+    # Occasionally send alerts
+    alert = _generate_alert(now)
+    if alert:
+        items.append(alert)
+
+    # System stats
+    items.append({
+        "type": "stats",
+        "timestamp": now,
+        "online_uavs": len(connections),
+        "active_missions": sum(1 for c in connections if c.get("flight_mode") == "AUTO"),
+        "today_detections": 1284 + step * random.randint(0, 3),
+        "active_tracks": random.randint(3, 8),
+        "connections": manager.connection_count,
+    })
+    return items
+
+
+async def _dashboard_producer():
+    """Single per-process tick loop; every dashboard subscriber gets the same frame."""
     step = 0
-    try:
-        while True:
-            data = _generate_detection_event(step)
-            await websocket.send_text(json.dumps(data, ensure_ascii=False))
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    while True:
+        if "dashboard" in manager.active_connections:
+            try:
+                # One frame per tick; the client unwraps "batch" into its items
+                await manager.broadcast("dashboard", {"type": "batch", "items": _dashboard_items(step)})
+            except Exception:
+                logger.exception("Dashboard tick failed")
             step += 1
-            await asyncio.sleep(0.5)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, f"detection:{session_id}")
+        # Fixed-rate schedule on the monotonic loop clock (no drift from send time)
+        next_tick = max(next_tick + _DASHBOARD_TICK_S, loop.time())
+        await asyncio.sleep(next_tick - loop.time())
+
+
+_producer_task: asyncio.Task | None = None
+
+
+def start_dashboard_producer():
+    global _producer_task
+    if _producer_task is None or _producer_task.done():
+        _producer_task = asyncio.create_task(_dashboard_producer())
+
+
+async def stop_dashboard_producer():
+    global _producer_task
+    if _producer_task is not None:
+        _producer_task.cancel()
+        try:
+            await _producer_task
+        except asyncio.CancelledError:
+            pass
+        _producer_task = None
 
 
 @router.websocket("/dashboard")
 async def ws_dashboard(websocket: WebSocket):
-    """Stream aggregated real-time data for the dashboard."""
+    """Subscribe to the aggregated dashboard stream (frames come from _dashboard_producer)."""
     await manager.connect(websocket, "dashboard")
-    step = 0
     try:
         while True:
-            # Only send telemetry for UAVs that are connected via flight controller
-            connections = flight_controller_service.list_connections()
-
-            for tel in connections:
-                uav_id = tel["uav_id"]
-                telemetry = {
-                    "type": "telemetry",
-                    "uav_id": uav_id,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "data": {
-                        "latitude": tel["latitude"],
-                        "longitude": tel["longitude"],
-                        "altitude": tel["altitude"],
-                        "speed": tel["speed"],
-                        "heading": tel["heading"],
-                        "battery": tel["battery"],
-                        "satellites": random.randint(10, 16),
-                        "signal_strength": -60 + random.randint(-10, 5),
-                        "flight_mode": tel["flight_mode"],
-                        "mission_waypoints": tel.get("mission_waypoints", []),
-                    },
-                }
-                await websocket.send_text(json.dumps(telemetry, ensure_ascii=False))
-
-            # Occasionally send detection events
-            if step % 3 == 0:
-                det = _generate_detection_event(step)
-                await websocket.send_text(json.dumps(det, ensure_ascii=False))
-
-            # Occasionally send alerts
-            alert = _generate_alert()
-            if alert:
-                await websocket.send_text(json.dumps(alert, ensure_ascii=False))
-
-            # Send system stats
-            stats = {
-                "type": "stats",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "online_uavs": len(connections),
-                "active_missions": sum(1 for c in connections if c.get("flight_mode") == "AUTO"),
-                "today_detections": 1284 + step * random.randint(0, 3),
-                "active_tracks": random.randint(3, 8),
-                "connections": manager.connection_count,
-            }
-            await websocket.send_text(json.dumps(stats, ensure_ascii=False))
-
-            step += 1
-            await asyncio.sleep(2)
+            # Nothing is expected from the client; this just waits for the disconnect
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket, "dashboard")
+        await manager.disconnect(websocket, "dashboard")
 
 
 @router.websocket("/status")
@@ -212,12 +316,12 @@ async def ws_status(websocket: WebSocket):
     await manager.connect(websocket, "status")
     try:
         while True:
-            await websocket.send_text(json.dumps({
+            await websocket.send_bytes(_encode({
                 "type": "heartbeat",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": utcnow(),
                 "connections": manager.connection_count,
                 "uptime_s": int(time.time()),
             }))
             await asyncio.sleep(5)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, "status")
+        await manager.disconnect(websocket, "status")
@@ -0,0 +1,110 @@
+"""
+Response cache for slow-changing aggregate endpoints.
+
+Uses Redis when it is reachable (shared across workers), with automatic
+fallback to a small in-process TTL store for development.
+Only cache data that is identical for every caller — never user-scoped
+responses.
+"""
+
+import logging
+import time
+from typing import Any
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Try to import the asyncio Redis client (optional at runtime)
+try:
+    import redis.asyncio as aioredis
+    _HAS_REDIS = True
+except ImportError:
+    aioredis = None  # type: ignore
+    _HAS_REDIS = False
+
+_KEY_PREFIX = "uav-cache"
+
+_redis: Any = None
+_local: dict[str, tuple[float, str]] = {}  # key -> (expires_at, payload)
+
+
+def _key(namespace: str, key: str) -> str:
+    return f"{_KEY_PREFIX}:{namespace}:{key}"
+
+
+async def init_redis(url: str | None = None) -> None:
+    """Connect to Redis; stay on the in-process store if unavailable."""
+    global _redis
+    if not _HAS_REDIS:
+        logger.warning("redis not installed — using in-process response cache")
+        return
+    client = aioredis.from_url(url or settings.REDIS_URL, decode_responses=True, socket_connect_timeout=1)
+    try:
+        await client.ping()
+    except Exception as e:
+        logger.warning("Redis unavailable (%s) — using in-process response cache", e)
+        await client.aclose()
+        return
+    _redis = client
+    logger.info("Redis response cache connected")
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def get_redis() -> Any:
+    """Return the shared Redis client, or None when running without Redis."""
+    return _redis
+
+
+async def cache_get(namespace: str, key: str) -> Any | None:
+    full_key = _key(namespace, key)
+    if _redis is not None:
+        try:
+            payload = await _redis.get(full_key)
+        except Exception as e:
+            logger.warning("Redis GET failed for %s: %s", full_key, e)
+            return None
+    else:
+        entry = _local.get(full_key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            _local.pop(full_key, None)
+            return None
+    return orjson.loads(payload) if payload is not None else None
+
+
+async def cache_set(namespace: str, key: str, value: Any, expire: int) -> None:
+    full_key = _key(namespace, key)
+    payload = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if _redis is not None:
+        try:
+            await _redis.set(full_key, payload, ex=expire)
+        except Exception as e:
+            logger.warning("Redis SET failed for %s: %s", full_key, e)
+        return
+    _local[full_key] = (time.monotonic() + expire, payload)
+
+
+async def cache_clear(namespace: str) -> None:
+    """Invalidate every cached entry in a namespace."""
+    prefix = _key(namespace, "")
+    if _redis is not None:
+        try:
+            keys = [k async for k in _redis.scan_iter(match=f"{prefix}*")]
+            if keys:
+                await _redis.delete(*keys)
+        except Exception as e:
+            logger.warning("Redis cache clear failed for %s: %s", namespace, e)
+        return
+    for k in [k for k in _local if k.startswith(prefix)]:
+        del _local[k]
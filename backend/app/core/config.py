@@ -10,6 +10,26 @@ class Settings(BaseSettings):
     SQLITE_URL: str = "sqlite+aiosqlite:///./uav_dev.db"
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # PostgreSQL connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection before erroring
+    # Ping on checkout costs a round-trip per request; enable where the database
+    # restarts or fails over under the app (recycle alone won't catch those)
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements kept per connection
+    DB_ECHO: bool = False  # log every SQL statement (debugging only; very slow)
+    # Create missing tables at startup (dev convenience); it never alters existing
+    # tables. Set False where the schema is managed with `alembic upgrade head`.
+    DB_CREATE_ALL: bool = True
+
+    # ONNX weights variant: fp32 ({model}.onnx), fp16 ({model}.fp16.onnx) or
+    # int8 ({model}.int8.onnx); falls back to fp32 when the variant file is missing
+    ONNX_PRECISION: str = "fp32"
+    # Models whose ONNX sessions are built at startup rather than on the first request
+    ONNX_PRELOAD_MODELS: list[str] = ["yolov8n"]
+
     MINIO_ENDPOINT: str = "localhost:9000"
     MINIO_ACCESS_KEY: str = "minioadmin"
     MINIO_SECRET_KEY: str = "minioadmin"
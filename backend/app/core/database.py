@@ -1,14 +1,46 @@
+import asyncio
+import zlib
+
+import orjson
+from sqlalchemy import JSON, Float, LargeBinary, TypeDecorator, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
+
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+# orjson for JSON/JSONB column (de)serialization on both backends
+_JSON_ENGINE_ARGS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
 if settings.USE_SQLITE:
     db_url = settings.SQLITE_URL
-    engine = create_async_engine(db_url, echo=settings.DEBUG, connect_args={"check_same_thread": False})
+    engine = create_async_engine(
+        db_url, echo=settings.DB_ECHO, connect_args={"check_same_thread": False}, **_JSON_ENGINE_ARGS,
+    )
 else:
     db_url = settings.DATABASE_URL
-    engine = create_async_engine(db_url, echo=settings.DEBUG)
+    engine = create_async_engine(
+        db_url,
+        echo=settings.DB_ECHO,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        **_JSON_ENGINE_ARGS,
+        connect_args={
+            # SQLAlchemy's per-connection prepared statement LRU, and asyncpg's own cache
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -17,6 +49,121 @@ class Base(DeclarativeBase):
     pass
 
 
+class CompressedJSON(TypeDecorator):
+    """
+    JSON stored as bytes, zlib-compressed once the encoding exceeds COMPRESS_MIN_BYTES.
+
+    Only for write-once / read-whole values: the database cannot query into it.
+    Compressed values start with the zlib header byte 0x78, which no JSON
+    document does; plain JSON bytes and legacy JSON text are read as-is.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    COMPRESS_MIN_BYTES = 1024
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = orjson.dumps(value)
+        return zlib.compress(data, 1) if len(data) >= self.COMPRESS_MIN_BYTES else data
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)) and value[:1] == b"\x78":
+            value = zlib.decompress(value)
+        return orjson.loads(value)
+
+
+# [[a, b], ...] numeric point lists: native float8[][] on PostgreSQL (no JSON
+# text to parse, ~3x smaller), compressed JSON elsewhere. Rows must be equal length.
+PointList = CompressedJSON().with_variant(ARRAY(Float, dimensions=2), "postgresql")
+
+# Document-shaped payloads: binary JSONB on PostgreSQL (parsed once on write,
+# GIN-indexable), plain JSON elsewhere.
+JSONDoc = JSON().with_variant(JSONB(), "postgresql")
+
+
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+def dialect_name(db: AsyncSession) -> str:
+    """Return the backend dialect of a session ("postgresql" or "sqlite")."""
+    return db.get_bind().dialect.name
+
+
+# Below this many rows an exact COUNT(*) is cheap and the planner estimate may be stale
+APPROX_COUNT_MIN_ROWS = 10_000
+
+
+async def approx_count(db: AsyncSession, table: str) -> int | None:
+    """
+    Planner row estimate for a whole table from pg_class.reltuples.
+
+    Returns None on SQLite, for never-analyzed tables, or for small tables
+    where an exact count should be used instead.
+    """
+    if dialect_name(db) != "postgresql":
+        return None
+    estimate = (await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :n"), {"n": table},
+    )).scalar()
+    if estimate is None or estimate < APPROX_COUNT_MIN_ROWS:
+        return None
+    return estimate
+
+
+async def _count(db: AsyncSession, count_query, estimate_table: str | None) -> int | None:
+    if estimate_table is not None:
+        estimate = await approx_count(db, estimate_table)
+        if estimate is not None:
+            return estimate
+    return await db.scalar(count_query)
+
+
+async def count_and_fetch(
+    db: AsyncSession,
+    count_db: AsyncSession,
+    count_query,
+    page_query,
+    estimate_table: str | None = None,
+):
+    """
+    Run a COUNT query and a page query, concurrently when the backend allows it.
+
+    The two statements must use separate sessions so each checks out its own
+    pooled connection. SQLite serializes access to one connection anyway,
+    so there they simply run in turn.
+    estimate_table: for unfiltered listings, use the planner's row estimate
+    for this table instead of a full COUNT(*) scan on large tables.
+    Returns (total, page_result).
+    """
+    if dialect_name(db) == "sqlite":
+        total = await db.scalar(count_query)
+        page = await db.execute(page_query)
+    else:
+        total, page = await asyncio.gather(
+            _count(count_db, count_query, estimate_table), db.execute(page_query),
+        )
+    return total or 0, page
+
+
+def newest_first_page(query, model, skip: int, cursor=None, cursor_id: int | None = None):
+    """
+    Order a listing by (created_at, id) DESC and select one page of it.
+
+    With a cursor (created_at and id of the last row on the previous page)
+    the page is a keyset seek; rows sharing that created_at are neither
+    skipped nor repeated because id breaks the tie. Without one it falls
+    back to OFFSET skip.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor is None:
+        return query.offset(skip)
+    if cursor_id is None:
+        return query.where(model.created_at < cursor)
+    return query.where(tuple_(model.created_at, model.id) < tuple_(cursor, cursor_id))
@@ -1,8 +1,14 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
 from app.core.database import get_db
@@ -11,35 +17,100 @@ from app.schemas.user import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
+# Recently authenticated tokens: token digest -> (expires_at, user column values).
+# Skips jwt.decode and the users SELECT on repeat requests; an entry lives at
+# most AUTH_CACHE_TTL seconds and never past the token's own exp.
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_MAX = 10_000
+_auth_cache: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
 
-async def get_current_user(
-    token: str | None = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+async def _cached_user(digest: bytes, db: AsyncSession) -> User | None:
+    entry = _auth_cache.get(digest)
+    if entry is None:
+        return None
+    expires_at, values = entry
+    if expires_at <= time.time():
+        _auth_cache.pop(digest, None)
+        return None
+    _auth_cache.move_to_end(digest)
+    user = User(**values)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+def _remember_user(digest: bytes, user: User, token_exp: Any) -> None:
+    now = time.time()
+    expires_at = now + AUTH_CACHE_TTL
+    if isinstance(token_exp, (int, float)):
+        expires_at = min(expires_at, token_exp)
+    if expires_at <= now:
+        return
+    if len(_auth_cache) >= AUTH_CACHE_MAX:
+        _auth_cache.popitem(last=False)
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    _auth_cache[digest] = (expires_at, values)
+
+
+def _require_token(token: str | None) -> str:
     if token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="未提供认证令牌",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return token
+
+
+def _decode_token(token: str) -> tuple[TokenData, dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: int | None = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="无效的认证令牌")
-        token_data = TokenData(user_id=int(user_id))
+        return TokenData(user_id=int(user_id)), payload
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="无效的认证令牌")
 
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalar_one_or_none()
+
+async def get_current_user(
+    token: str | None = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    token = _require_token(token)
+    digest = _token_digest(token)
+    cached = await _cached_user(digest, db)
+    if cached is not None:
+        return cached
+
+    token_data, payload = _decode_token(token)
+    user = await db.get(User, token_data.user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="用户不存在")
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="用户已被禁用")
+    _remember_user(digest, user, payload.get("exp"))
     return user
 
 
+async def get_current_user_id(token: str | None = Depends(oauth2_scheme)) -> int:
+    """
+    Authenticated user id straight from the token — no database access.
+
+    Does not re-check that the account still exists or is active; use
+    get_current_user where a disabled account must be refused.
+    """
+    token = _require_token(token)
+    entry = _auth_cache.get(_token_digest(token))
+    if entry is not None and entry[0] > time.time():
+        return entry[1]["id"]
+    return _decode_token(token)[0].user_id
+
+
 async def get_current_user_optional(
     token: str | None = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
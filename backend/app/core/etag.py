@@ -0,0 +1,25 @@
+"""
+Conditional GET support for high-frequency polling endpoints.
+
+The ETag is a short hash of the serialized body. When the client's
+If-None-Match matches, a bodyless 304 is returned instead.
+"""
+
+from hashlib import blake2b
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def etag_response(request: Request, payload: Any) -> Response:
+    """Serialize payload once, tag it, and answer 304 if the client already has it."""
+    body = orjson.dumps(jsonable_encoder(payload), option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    etag = f'"{blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
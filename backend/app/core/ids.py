@@ -0,0 +1,26 @@
+"""Short random / time-ordered identifiers for uploads and sessions."""
+import itertools
+import secrets
+import time
+
+# Process-local sequence; makes session ids unique within a worker without relying on randomness
+_session_counter = itertools.count()
+
+
+def new_file_id() -> str:
+    """12 hex chars from a single 6-byte urandom read."""
+    return secrets.token_hex(6)
+
+
+def new_session_id() -> str:
+    """
+    Time-ordered session id as 20 hex chars.
+
+    48-bit millisecond timestamp + 16-bit process counter + 16 random bits:
+    unique within a worker unless 65536 sessions start in the same
+    millisecond, and the random tail separates workers.
+    """
+    seq = next(_session_counter) & 0xFFFF
+    return (
+        int(time.time() * 1000).to_bytes(6, "big") + seq.to_bytes(2, "big") + secrets.token_bytes(2)
+    ).hex()
@@ -0,0 +1,108 @@
+"""
+Cheap image dimension probing for upload endpoints.
+
+PNG / JPEG / WebP sizes are read straight from the file header; anything
+else falls back to Pillow in a worker thread so the event loop never blocks.
+"""
+
+import asyncio
+import io
+import struct
+from typing import BinaryIO
+
+# Pillow is optional; only needed for formats the header sniffer doesn't know
+try:
+    from PIL import Image
+    Image.MAX_IMAGE_PIXELS = 50_000_000  # reject decompression bombs on untrusted uploads
+except ImportError:
+    Image = None  # type: ignore
+
+
+# JPEG start-of-frame markers (SOF0-SOF15, excluding DHT/JPG/DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def sniff_size(data: bytes) -> tuple[int, int] | None:
+    """Parse (width, height) from PNG / JPEG / WebP headers without decoding pixels."""
+    # PNG: IHDR is always the first chunk
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        w, h = struct.unpack(">II", data[16:24])
+        return w, h
+
+    # JPEG: walk marker segments until a SOFn frame header
+    if data[:2] == b"\xff\xd8":
+        i, n = 2, len(data)
+        while i + 9 <= n:
+            if data[i] != 0xFF:
+                return None
+            marker = data[i + 1]
+            if marker == 0xFF:  # fill byte
+                i += 1
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                h, w = struct.unpack(">HH", data[i + 5:i + 9])
+                return w, h
+            if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # standalone markers
+                i += 2
+                continue
+            i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+        return None
+
+    # WebP: lossy (VP8), lossless (VP8L) or extended (VP8X)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        fourcc = data[12:16]
+        if fourcc == b"VP8X":
+            return 1 + int.from_bytes(data[24:27], "little"), 1 + int.from_bytes(data[27:30], "little")
+        if fourcc == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if fourcc == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+    return None
+
+
+# Enough to reach the SOF marker of JPEGs carrying a full EXIF/APP1 block
+_HEADER_PROBE_BYTES = 64 * 1024
+
+
+def as_stream(image: bytes | BinaryIO) -> BinaryIO:
+    """Wrap raw bytes in a BytesIO; rewind and return file-like objects unchanged."""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return io.BytesIO(image)
+    image.seek(0)
+    return image
+
+
+def _pil_image_size(image: bytes | BinaryIO) -> tuple[int, int]:
+    """Try to read (width, height) from image bytes or a file using PIL, fallback to (640, 480)."""
+    if Image is None:
+        return (640, 480)
+    stream = as_stream(image)
+    try:
+        img = Image.open(stream)
+        return img.size  # (width, height)
+    except Exception:
+        return (640, 480)
+    finally:
+        stream.seek(0)
+
+
+async def read_image_size(image: bytes | BinaryIO) -> tuple[int, int]:
+    """
+    Read (width, height) from the header; other formats go through PIL in a worker thread.
+
+    Accepts raw bytes or a seekable upload file (only the header is read;
+    the file is left rewound to 0).
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        head = image
+    else:
+        image.seek(0)
+        head = image.read(_HEADER_PROBE_BYTES)
+        image.seek(0)
+    size = sniff_size(head)
+    if size is not None:
+        return size
+    return await asyncio.to_thread(_pil_image_size, image)
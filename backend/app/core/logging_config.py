@@ -4,7 +4,7 @@ Structured logging configuration for the UAV Detection System backend.
 
 import logging
 import sys
-from datetime import datetime, timezone
+import time
 
 
 class StructuredFormatter(logging.Formatter):
@@ -22,19 +22,28 @@ class StructuredFormatter(logging.Formatter):
     def __init__(self, use_color: bool = True):
         super().__init__()
         self.use_color = use_color
+        # Padded (and colored) level labels, built once
+        self._level_strs = {
+            level: f"{color}{level:8s}{self.RESET}" if use_color else f"{level:8s}"
+            for level, color in self.LEVEL_COLORS.items()
+        }
+        # (epoch second, formatted UTC timestamp) of the last record
+        self._last_ts: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        sec = int(created)
+        cached_sec, cached_str = self._last_ts
+        if sec == cached_sec:
+            return cached_str
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(sec))
+        self._last_ts = (sec, ts)
+        return ts
 
     def format(self, record: logging.LogRecord) -> str:
-        ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        ts = self._timestamp(record.created)
         level = record.levelname
-        name = record.name
-        msg = record.getMessage()
-
-        if self.use_color and level in self.LEVEL_COLORS:
-            level_str = f"{self.LEVEL_COLORS[level]}{level:8s}{self.RESET}"
-        else:
-            level_str = f"{level:8s}"
-
-        line = f"{ts} | {level_str} | {name} | {msg}"
+        level_str = self._level_strs.get(level) or f"{level:8s}"
+        line = f"{ts} | {level_str} | {record.name} | {record.getMessage()}"
 
         if record.exc_info and not record.exc_text:
             record.exc_text = self.formatException(record.exc_info)
@@ -1,20 +1,58 @@
 """
-Simple in-memory rate limiting middleware for FastAPI.
+Token bucket rate limiting middleware for FastAPI.
 
-In production, replace with Redis-based rate limiting for
-distributed deployments.
+Buckets live in Redis (one hash per client IP, updated atomically by a Lua
+script) so the limit holds across all uvicorn workers and restarts. Without
+Redis, falls back to per-process in-memory buckets.
 """
 
 import time
 import logging
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Any
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
+from app.core.cache import get_redis
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on tracked client IPs; least recently seen are evicted first
+MAX_TRACKED_CLIENTS = 10_000
+
+
+_KEY_PREFIX = "uav-ratelimit"
+
+# KEYS[1] = bucket key; ARGV = tokens per ms, burst, ttl ms. Returns 1 if allowed.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+local tokens = tonumber(b[1]) or burst
+local last = tonumber(b[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - last) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return allowed
+"""
+
+
+class _Bucket:
+    __slots__ = ("tokens", "last")
+
+    def __init__(self, tokens: float, last: float):
+        self.tokens = tokens
+        self.last = last
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
@@ -30,9 +68,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.rate = requests_per_minute / 60.0  # tokens per second
         self.burst = burst
-        self._buckets: dict[str, dict] = defaultdict(
-            lambda: {"tokens": burst, "last": time.monotonic()}
-        )
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        # A bucket left idle this long is full again, so Redis may drop it
+        self._ttl_ms = int(burst / self.rate * 1000) + 1000
+        self._script: Any = None  # redis-py Script (caches the EVALSHA digest)
+        self._script_client: Any = None
 
     def _get_client_ip(self, request: Request) -> str:
         forwarded = request.headers.get("x-forwarded-for")
@@ -40,21 +80,39 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return forwarded.split(",")[0].strip()
         return request.client.host if request.client else "unknown"
 
-    def _consume(self, ip: str) -> bool:
+    async def _consume(self, ip: str) -> bool:
         """Try to consume a token. Returns True if allowed."""
+        redis = get_redis()
+        if redis is not None:
+            if self._script_client is not redis:
+                self._script = redis.register_script(_TOKEN_BUCKET_LUA)
+                self._script_client = redis
+            try:
+                allowed = await self._script(
+                    keys=[f"{_KEY_PREFIX}:{ip}"],
+                    args=[self.rate / 1000.0, self.burst, self._ttl_ms],
+                )
+                return bool(int(allowed))
+            except Exception as e:
+                logger.warning("Redis rate limit check failed, using local bucket: %s", e)
+        return self._consume_local(ip)
+
+    def _consume_local(self, ip: str) -> bool:
         now = time.monotonic()
-        bucket = self._buckets[ip]
-        elapsed = now - bucket["last"]
-        bucket["last"] = now
-
-        # Refill tokens
-        bucket["tokens"] = min(
-            self.burst,
-            bucket["tokens"] + elapsed * self.rate,
-        )
-
-        if bucket["tokens"] >= 1.0:
-            bucket["tokens"] -= 1.0
+        buckets = self._buckets
+        bucket = buckets.get(ip)
+        if bucket is None:
+            if len(buckets) >= MAX_TRACKED_CLIENTS:
+                buckets.popitem(last=False)
+            bucket = buckets[ip] = _Bucket(self.burst, now)
+        else:
+            buckets.move_to_end(ip)
+            # Refill tokens
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.last) * self.rate)
+            bucket.last = now
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
             return True
         return False
 
@@ -69,7 +127,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         ip = self._get_client_ip(request)
 
-        if not self._consume(ip):
+        if not await self._consume(ip):
             logger.warning("Rate limit exceeded for IP: %s on %s", ip, path)
             return JSONResponse(
                 status_code=429,
@@ -0,0 +1,88 @@
+"""
+Shared key/value state for data that must be visible to every worker.
+
+Backed by Redis hashes (``uav-state:{namespace}:{key}``) when the shared
+client from app.core.cache is connected, with an in-process dict fallback
+for single-worker development. Field values are stored as JSON.
+"""
+
+import logging
+import time
+from typing import Any
+
+import orjson
+
+from app.core.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "uav-state"
+
+_local: dict[str, tuple[float | None, dict[str, Any]]] = {}  # key -> (expires_at, mapping)
+
+
+def _key(namespace: str, key: str) -> str:
+    return f"{_KEY_PREFIX}:{namespace}:{key}"
+
+
+async def state_put(namespace: str, key: str, mapping: dict[str, Any], expire: int | None = None) -> None:
+    """Store a record (HSET); optional TTL in seconds."""
+    full_key = _key(namespace, key)
+    redis = get_redis()
+    if redis is None:
+        _local[full_key] = (time.monotonic() + expire if expire else None, dict(mapping))
+        return
+    fields = {k: orjson.dumps(v, default=str, option=orjson.OPT_NON_STR_KEYS) for k, v in mapping.items()}
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(full_key)
+            pipe.hset(full_key, mapping=fields)
+            if expire:
+                pipe.expire(full_key, expire)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Redis HSET failed for %s: %s", full_key, e)
+
+
+def _local_get(full_key: str) -> dict[str, Any] | None:
+    entry = _local.get(full_key)
+    if entry is None:
+        return None
+    expires_at, mapping = entry
+    if expires_at is not None and expires_at <= time.monotonic():
+        _local.pop(full_key, None)
+        return None
+    return mapping
+
+
+async def state_get(namespace: str, key: str) -> dict[str, Any] | None:
+    full_key = _key(namespace, key)
+    redis = get_redis()
+    if redis is None:
+        mapping = _local_get(full_key)
+        return dict(mapping) if mapping is not None else None
+    try:
+        fields = await redis.hgetall(full_key)
+    except Exception as e:
+        logger.warning("Redis HGETALL failed for %s: %s", full_key, e)
+        return None
+    return {k: orjson.loads(v) for k, v in fields.items()} if fields else None
+
+
+async def state_values(namespace: str) -> list[dict[str, Any]]:
+    """All live records in a namespace (SCAN MATCH on Redis)."""
+    prefix = _key(namespace, "")
+    redis = get_redis()
+    if redis is None:
+        records = (_local_get(k) for k in [k for k in _local if k.startswith(prefix)])
+        return [dict(m) for m in records if m is not None]
+    try:
+        records = []
+        async for full_key in redis.scan_iter(match=f"{prefix}*"):
+            fields = await redis.hgetall(full_key)
+            if fields:
+                records.append({k: orjson.loads(v) for k, v in fields.items()})
+        return records
+    except Exception as e:
+        logger.warning("Redis SCAN failed for %s: %s", namespace, e)
+        return []
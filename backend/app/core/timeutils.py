@@ -0,0 +1,6 @@
+"""Shared clock helpers."""
+from datetime import datetime, timezone
+from functools import partial
+
+# Timezone-aware UTC "now" without rebuilding the call each time
+utcnow = partial(datetime.now, timezone.utc)
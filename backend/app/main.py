@@ -1,12 +1,16 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text as select_text
 
 from app.api import auth, missions, devices, detections, tracking, planning, settings, flight, datasets, training, alerts
-from app.api.websocket import router as ws_router
+from app.api.websocket import router as ws_router, start_dashboard_producer, stop_dashboard_producer
+from app.core.cache import init_redis, close_redis
+from app.core.config import settings as app_settings
 from app.core.database import engine, Base
 from app.core.logging_config import setup_logging
 from app.core.rate_limit import RateLimitMiddleware
@@ -20,17 +24,29 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables (dev only — use Alembic in production)
     logger.info("Starting UAV Detection System...")
+    logger.info("Event loop: %s", type(asyncio.get_running_loop()).__name__)
     logger.info("Detection mode: %s", "REAL" if detector_service.is_real_mode else "MOCK")
     logger.info("ONNX Runtime: %s (providers: %s)", "YES" if onnx_detector_service.is_available else "NO", onnx_detector_service.providers)
     logger.info("Tracking mode: %s", "REAL" if tracker_service.is_real_mode else "MOCK")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables ready")
+    # Set DB_CREATE_ALL=False once the schema is managed by migrations, to skip
+    # the per-table existence checks on every (worker) start.
+    if app_settings.DB_CREATE_ALL:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info("Database tables ready")
+    else:
+        logger.info("Skipping create_all (DB_CREATE_ALL off)")
+    await init_redis()
+    if onnx_detector_service.is_available:
+        await onnx_detector_service.preload(app_settings.ONNX_PRELOAD_MODELS)
+    start_dashboard_producer()
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await stop_dashboard_producer()
+    await onnx_detector_service.close()
+    await close_redis()
     await engine.dispose()
 
 
@@ -39,6 +55,7 @@ app = FastAPI(
     description="无人机智能巡检系统后端 API",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
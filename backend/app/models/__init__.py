@@ -1,8 +1,8 @@
 from app.models.user import User
 from app.models.device import Device
 from app.models.mission import Mission
-from app.models.detection_result import DetectionResult, TrackingResult
+from app.models.detection_result import DetectionResult, DetectionBoxRow, TrackingResult
 from app.models.dataset import Dataset, TrainingJob
 from app.models.alert import AlertRule, Alert
 
-__all__ = ["User", "Device", "Mission", "DetectionResult", "TrackingResult", "Dataset", "TrainingJob", "AlertRule", "Alert"]
+__all__ = ["User", "Device", "Mission", "DetectionResult", "DetectionBoxRow", "TrackingResult", "Dataset", "TrainingJob", "AlertRule", "Alert"]
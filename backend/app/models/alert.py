@@ -1,10 +1,11 @@
 """告警规则与告警记录模型"""
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, Integer, ForeignKey, JSON, Text, Boolean
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Text, Boolean, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import Base, JSONDoc
+from app.core.timeutils import utcnow
 
 
 class AlertRule(Base):
@@ -17,19 +18,31 @@ class AlertRule(Base):
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     severity: Mapped[str] = mapped_column(String(20), default="warning")  # info / warning / critical
     trigger_type: Mapped[str] = mapped_column(String(50))  # detection / geofence / battery / signal / custom
-    conditions: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    conditions: Mapped[dict | None] = mapped_column(JSONDoc, nullable=True)
     # e.g. {"class_name": "drone", "confidence_min": 0.7}
     # e.g. {"battery_below": 20}
     # e.g. {"geofence": {"lat": 30.0, "lng": 120.0, "radius_m": 500}}
     cooldown_seconds: Mapped[int] = mapped_column(Integer, default=60)
     creator_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
 
 class Alert(Base):
     """告警记录 — 已触发的告警"""
     __tablename__ = "alerts"
+    __table_args__ = (
+        # list_alerts: WHERE severity / acknowledged ORDER BY created_at DESC
+        Index("ix_alert_sev_ack_ct", "severity", "acknowledged", text("created_at DESC"), text("id DESC")),
+        # unfiltered list_alerts / cursor paging
+        Index("ix_alert_ct", text("created_at DESC"), text("id DESC")),
+        # unacknowledged feed (?acknowledged=false): partial, only the open rows
+        Index(
+            "ix_alert_unack_ct", text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("NOT acknowledged"),
+            sqlite_where=text("NOT acknowledged"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     rule_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("alert_rules.id"), nullable=True)
@@ -37,12 +50,18 @@ class Alert(Base):
     title: Mapped[str] = mapped_column(String(300))
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
     source: Mapped[str] = mapped_column(String(100), default="system")  # detection / geofence / battery / manual
-    device_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("devices.id"), nullable=True)
-    mission_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("missions.id"), nullable=True)
-    metadata_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    device_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("devices.id"), nullable=True, index=True)
+    mission_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("missions.id"), nullable=True, index=True)
+    metadata_json: Mapped[dict | None] = mapped_column(JSONDoc, nullable=True)
     acknowledged: Mapped[bool] = mapped_column(Boolean, default=False)
     acknowledged_by: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
     acknowledged_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     resolved: Mapped[bool] = mapped_column(Boolean, default=False)
     resolved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    # lazy="raise": list endpoints read FK ids only; load these explicitly with
+    # selectinload() where needed instead of one lazy query per row
+    rule: Mapped["AlertRule | None"] = relationship(lazy="raise")
+    device: Mapped["Device | None"] = relationship(lazy="raise")
+    mission: Mapped["Mission | None"] = relationship(lazy="raise")
@@ -1,10 +1,11 @@
 """数据集与训练任务模型"""
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, Integer, ForeignKey, JSON, Text
+from sqlalchemy import String, Float, DateTime, Integer, ForeignKey, JSON, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.core.database import Base
+from app.core.database import Base, JSONDoc
+from app.core.timeutils import utcnow
 
 
 class Dataset(Base):
@@ -23,12 +24,18 @@ class Dataset(Base):
     split_ratio: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # {"train": 0.8, "val": 0.1, "test": 0.1}
     creator_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="draft")  # draft / ready / archived
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
 
 class TrainingJob(Base):
     __tablename__ = "training_jobs"
+    __table_args__ = (
+        # list_training_jobs: WHERE status ORDER BY created_at DESC
+        Index("ix_training_jobs_status_created", "status", text("created_at DESC")),
+        # unfiltered list_training_jobs
+        Index("ix_training_jobs_created", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200))
@@ -42,10 +49,10 @@ class TrainingJob(Base):
     status: Mapped[str] = mapped_column(String(20), default="pending")  # pending / running / completed / failed
     progress: Mapped[float] = mapped_column(Float, default=0.0)  # 0-100
     current_epoch: Mapped[int] = mapped_column(Integer, default=0)
-    metrics: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # {"mAP50": 0.85, "mAP50-95": 0.62, ...}
+    metrics: Mapped[dict | None] = mapped_column(JSONDoc, nullable=True)  # {"mAP50": 0.85, "mAP50-95": 0.62, ...}
     output_model_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     creator_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
@@ -1,34 +1,75 @@
 """检测结果模型"""
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, Integer, ForeignKey, JSON
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Float, DateTime, Integer, SmallInteger, ForeignKey, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import Base, PointList, JSONDoc
+from app.core.timeutils import utcnow
+
+# detection_boxes stores confidence as round(confidence * BOX_CONF_SCALE)
+BOX_CONF_SCALE = 10_000
 
 
 class DetectionResult(Base):
     __tablename__ = "detection_results"
+    __table_args__ = (
+        # list_detection_results: WHERE mission_id ORDER BY created_at DESC
+        Index("ix_det_mission_ct", "mission_id", text("created_at DESC"), text("id DESC")),
+        # WHERE device_id ORDER BY created_at DESC (also serves the device FK)
+        Index("ix_det_device_ct", "device_id", text("created_at DESC"), text("id DESC")),
+        # get_detection_stats: created_at >= today_start / trend window
+        Index("ix_det_ct", text("created_at DESC"), text("id DESC")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     mission_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("missions.id"), nullable=True)
     device_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("devices.id"), nullable=True)
     image_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
     model_name: Mapped[str] = mapped_column(String(100), default="yolov8n")
-    detections: Mapped[list | None] = mapped_column(JSON, nullable=True)  # [{class_name, confidence, bbox}, ...]
+    detections: Mapped[list | None] = mapped_column(JSONDoc, nullable=True)  # [{class_name, confidence, bbox}, ...]
     detection_count: Mapped[int] = mapped_column(Integer, default=0)
     inference_time_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    # Never lazy-loaded; use selectinload() where the related rows are needed
+    mission: Mapped["Mission | None"] = relationship(lazy="raise")
+    device: Mapped["Device | None"] = relationship(lazy="raise")
+
+
+class DetectionBoxRow(Base):
+    """One detected box of a DetectionResult, kept relational for SQL aggregation."""
+    __tablename__ = "detection_boxes"
+    __table_args__ = (
+        # get_detection_stats: class distribution over recent results
+        Index("ix_boxes_result_class", "result_id", "class_name"),
+        Index("ix_boxes_class", "class_name"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    result_id: Mapped[int] = mapped_column(Integer, ForeignKey("detection_results.id", ondelete="CASCADE"))
+    class_id: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    class_name: Mapped[str] = mapped_column(String(100), default="unknown")
+    # Quantized 2-byte copies for aggregation; exact floats stay in DetectionResult.detections
+    confidence: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)  # x BOX_CONF_SCALE
+    x1: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)  # whole pixels
+    y1: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    x2: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    y2: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
 
 
 class TrackingResult(Base):
     __tablename__ = "tracking_results"
+    __table_args__ = (
+        # list_tracks: WHERE mission_id ORDER BY created_at DESC
+        Index("ix_tracking_mission_created", "mission_id", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     mission_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("missions.id"), nullable=True)
     tracker_type: Mapped[str] = mapped_column(String(50), default="deep_sort")
     track_id: Mapped[int] = mapped_column(Integer)
     class_name: Mapped[str] = mapped_column(String(100))
-    trajectory: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # [[x, y], ...]
+    trajectory: Mapped[list[list[float]] | None] = mapped_column(PointList, nullable=True)  # [[x, y], ...]
     total_frames: Mapped[int] = mapped_column(Integer, default=0)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
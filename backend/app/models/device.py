@@ -1,10 +1,11 @@
 """设备模型"""
-from datetime import datetime, timezone
+from datetime import datetime
 
 from sqlalchemy import String, Float, DateTime, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+from app.core.timeutils import utcnow
 
 
 class Device(Base):
@@ -20,5 +21,5 @@ class Device(Base):
     altitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     battery: Mapped[float | None] = mapped_column(Float, nullable=True)
     owner_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
@@ -1,25 +1,32 @@
 """任务模型"""
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime, Integer, ForeignKey, JSON
+from sqlalchemy import String, Float, DateTime, Integer, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.core.database import Base
+from app.core.database import Base, PointList
+from app.core.timeutils import utcnow
 
 
 class Mission(Base):
     __tablename__ = "missions"
+    __table_args__ = (
+        # list_missions: WHERE status ORDER BY created_at DESC
+        Index("ix_missions_status_created", "status", text("created_at DESC")),
+        # unfiltered list_missions
+        Index("ix_missions_created", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200))
     description: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="pending")  # pending / running / completed / failed
     mission_type: Mapped[str] = mapped_column(String(50), default="inspection")  # inspection / patrol / survey
-    device_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("devices.id"), nullable=True)
+    device_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("devices.id"), nullable=True, index=True)
     creator_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
-    waypoints: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    waypoints: Mapped[list[list[float]] | None] = mapped_column(PointList, nullable=True)
     algorithm: Mapped[str | None] = mapped_column(String(50), nullable=True)
     total_distance: Mapped[float | None] = mapped_column(Float, nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
@@ -1,13 +1,17 @@
+from typing import Literal
+
 from pydantic import BaseModel
 from datetime import datetime
 
+TriggerType = Literal["detection", "geofence", "battery", "signal", "custom"]
+
 
 class AlertRuleCreate(BaseModel):
     name: str
     description: str | None = None
     enabled: bool = True
     severity: str = "warning"
-    trigger_type: str
+    trigger_type: TriggerType
     conditions: dict | None = None
     cooldown_seconds: int = 60
 
@@ -1,6 +1,11 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 from datetime import datetime
 
+# [lat, lng]; fixed length so the PostgreSQL float8[][] column stays rectangular
+Waypoint = Annotated[list[float], Field(min_length=2, max_length=2)]
+
 
 class MissionBase(BaseModel):
     name: str
@@ -10,7 +15,7 @@ class MissionBase(BaseModel):
 
 class MissionCreate(MissionBase):
     device_id: int
-    waypoints: list[list[float]] = []
+    waypoints: list[Waypoint] = []
     algorithm: str | None = None
     altitude: float = 100.0
     speed: float = 8.0
@@ -5,15 +5,21 @@ Supports real Ultralytics YOLO models when available,
 with automatic fallback to mock detections for development.
 """
 
+import hashlib
 import logging
-import random
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+import numpy as np
+
+from app.services.onnx_detector import onnx_detector_service
 
 logger = logging.getLogger(__name__)
 
 # Try to import ultralytics; if unavailable, use mock mode
 try:
+    import cv2  # Ultralytics dependency; decodes uploads for inference
     from ultralytics import YOLO
     _HAS_ULTRALYTICS = True
     logger.info("Ultralytics YOLO available — real inference enabled")
@@ -25,12 +31,35 @@ except ImportError:
 # Default model weights directory
 WEIGHTS_DIR = Path(__file__).resolve().parent.parent.parent / "weights"
 
+# Mock mode classes; index == class_id
+_MOCK_CLASSES = ("drone", "bird", "airplane", "helicopter", "uav")
+_rng = np.random.default_rng()
+
+# Inference result cache for repeated frames (paused streams, duplicate uploads)
+INFER_CACHE_MAX = 256
+INFER_CACHE_MAX_BYTES = 2 * 1024 * 1024  # larger images are never cached
+
+
+def _pil_decode_bgr(data: bytes) -> np.ndarray:
+    """Decode formats OpenCV can't (e.g. GIF) with Pillow, as the BGR array Ultralytics expects."""
+    try:
+        from PIL import Image
+        from app.core.imaging import as_stream
+        rgb = np.asarray(Image.open(as_stream(data)).convert("RGB"))
+    except Exception as e:
+        raise ValueError("Cannot decode image") from e
+    return np.ascontiguousarray(rgb[:, :, ::-1])
+
 
 class DetectorService:
     """Manages YOLO model loading and inference."""
 
     def __init__(self):
         self._models: dict[str, Any] = {}
+        # ((scanned dir mtimes, loaded model ids), model list) for available_models
+        self._models_cache: tuple[tuple, list[dict]] | None = None
+        # (model_name, confidence, blake2b digest) -> detections, LRU order
+        self._infer_cache: OrderedDict[tuple[str, float, bytes], list[dict]] = OrderedDict()
 
     def _get_model(self, model_name: str) -> Any:
         """Load or retrieve a cached YOLO model."""
@@ -54,7 +83,7 @@ class DetectorService:
 
     def detect_image(
         self,
-        image_bytes: bytes,
+        image: bytes | BinaryIO,
         model_name: str = "yolov8n",
         confidence: float = 0.5,
         image_size: tuple[int, int] | None = None,
@@ -66,59 +95,118 @@ class DetectorService:
         Returns list of dicts with keys:
         x1, y1, x2, y2, confidence, class_name, class_id
 
+        image: raw bytes or a seekable file (e.g. an UploadFile's spooled file).
         image_size: (width, height) of the original image, used by mock mode.
         """
+        if not onnx_detector_service.is_available and not _HAS_ULTRALYTICS:
+            # Mock mode — use actual image dimensions for realistic boxes
+            img_w, img_h = image_size or (640, 480)
+            return self._mock_detect(model_name, confidence, img_w, img_h)
+
+        image, key = self._infer_key(image, model_name, confidence)
+        if key is not None and (hit := self._infer_cache.get(key)) is not None:
+            self._infer_cache.move_to_end(key)
+            return [dict(d) for d in hit]
+
         # Try ONNX first (fastest)
-        from app.services.onnx_detector import onnx_detector_service
-        onnx_result = onnx_detector_service.detect_image(
-            image_bytes, model_name, confidence, image_size=image_size,
+        detections = onnx_detector_service.detect_image(
+            image, model_name, confidence, image_size=image_size,
         )
-        if onnx_result is not None:
-            return onnx_result
+        if detections is None:
+            # Fall back to Ultralytics
+            model = self._get_model(model_name)
+            if model is None:
+                img_w, img_h = image_size or (640, 480)
+                return self._mock_detect(model_name, confidence, img_w, img_h)
+            detections = self._predict(model, image, model_name, confidence)
+
+        self._remember(key, detections)
+        return detections
 
-        # Fall back to Ultralytics
-        model = self._get_model(model_name)
+    async def detect_image_async(
+        self,
+        image: bytes | BinaryIO,
+        model_name: str = "yolov8n",
+        confidence: float = 0.5,
+        image_size: tuple[int, int] | None = None,
+    ) -> list[dict]:
+        """detect_image for async callers: ONNX requests are micro-batched across concurrent calls."""
+        if not onnx_detector_service.is_available:
+            return self.detect_image(image, model_name, confidence, image_size)
 
-        if model is None:
-            # Mock mode — use actual image dimensions for realistic boxes
-            img_w, img_h = image_size or (640, 480)
-            return self._mock_detect(model_name, confidence, img_w, img_h)
+        image, key = self._infer_key(image, model_name, confidence)
+        if key is not None and (hit := self._infer_cache.get(key)) is not None:
+            self._infer_cache.move_to_end(key)
+            return [dict(d) for d in hit]
+
+        detections = await onnx_detector_service.detect_image_async(
+            image, model_name, confidence, image_size=image_size,
+        )
+        if detections is None:
+            # No ONNX weights for this model: Ultralytics / mock path
+            return self.detect_image(image, model_name, confidence, image_size)
+        self._remember(key, detections)
+        return detections
 
-        # Real inference
-        import tempfile, os
-        tmp = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
-        try:
-            tmp.write(image_bytes)
-            tmp.flush()
-            tmp.close()
-
-            results = model.predict(
-                source=tmp.name,
-                conf=confidence,
-                verbose=False,
-            )
-
-            detections = []
-            for result in results:
-                for box in result.boxes:
-                    xyxy = box.xyxy[0].tolist()
-                    detections.append({
-                        "x1": round(xyxy[0], 1),
-                        "y1": round(xyxy[1], 1),
-                        "x2": round(xyxy[2], 1),
-                        "y2": round(xyxy[3], 1),
-                        "confidence": round(float(box.conf[0]), 4),
-                        "class_name": result.names[int(box.cls[0])],
-                        "class_id": int(box.cls[0]),
-                    })
-
-            logger.info(
-                "Detection complete: model=%s, objects=%d",
-                model_name, len(detections),
-            )
-            return detections
-        finally:
-            os.unlink(tmp.name)
+    def _remember(self, key: tuple[str, float, bytes] | None, detections: list[dict]):
+        if key is not None:
+            self._infer_cache[key] = [dict(d) for d in detections]
+            if len(self._infer_cache) > INFER_CACHE_MAX:
+                self._infer_cache.popitem(last=False)
+
+    @staticmethod
+    def _infer_key(
+        image: bytes | BinaryIO, model_name: str, confidence: float,
+    ) -> tuple[bytes | BinaryIO, tuple[str, float, bytes] | None]:
+        """Return (image, cache key); small files are read into bytes so they are only read once."""
+        if not isinstance(image, (bytes, bytearray, memoryview)):
+            image.seek(0, 2)
+            size = image.tell()
+            image.seek(0)
+            if size > INFER_CACHE_MAX_BYTES:
+                return image, None
+            image = image.read()
+        elif len(image) > INFER_CACHE_MAX_BYTES:
+            return image, None
+        return image, (model_name, confidence, hashlib.blake2b(image, digest_size=16).digest())
+
+    @staticmethod
+    def _predict(model: Any, image: bytes | BinaryIO, model_name: str, confidence: float) -> list[dict]:
+        """Real inference: decode in memory and hand Ultralytics the BGR array."""
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            data = image
+        else:
+            image.seek(0)
+            data = image.read()
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            frame = _pil_decode_bgr(data)
+
+        results = model.predict(
+            source=frame,
+            conf=confidence,
+            verbose=False,
+        )
+
+        detections = []
+        for result in results:
+            for box in result.boxes:
+                xyxy = box.xyxy[0].tolist()
+                detections.append({
+                    "x1": round(xyxy[0], 1),
+                    "y1": round(xyxy[1], 1),
+                    "x2": round(xyxy[2], 1),
+                    "y2": round(xyxy[3], 1),
+                    "confidence": round(float(box.conf[0]), 4),
+                    "class_name": result.names[int(box.cls[0])],
+                    "class_id": int(box.cls[0]),
+                })
+
+        logger.info(
+            "Detection complete: model=%s, objects=%d",
+            model_name, len(detections),
+        )
+        return detections
 
     @staticmethod
     def _mock_detect(
@@ -128,30 +216,24 @@ class DetectorService:
         img_h: int = 480,
     ) -> list[dict]:
         """Generate mock detection results scaled to actual image size."""
-        classes = [
-            ("drone", 0), ("bird", 1), ("airplane", 2),
-            ("helicopter", 3), ("uav", 4),
+        n = int(_rng.integers(1, 5))
+        ids = _rng.integers(0, len(_MOCK_CLASSES), n)
+        conf = _rng.uniform(max(confidence, 0.5), 0.99, n).round(4)
+        # Generate boxes proportional to actual image dimensions
+        box_w = _rng.uniform(img_w * 0.08, img_w * 0.30, n)
+        box_h = _rng.uniform(img_h * 0.08, img_h * 0.30, n)
+        x1 = _rng.uniform(img_w * 0.05, img_w - box_w - img_w * 0.05)
+        y1 = _rng.uniform(img_h * 0.05, img_h - box_h - img_h * 0.05)
+        boxes = np.round(np.stack([x1, y1, x1 + box_w, y1 + box_h], axis=1), 1).tolist()
+        return [
+            {
+                "x1": x1_, "y1": y1_, "x2": x2_, "y2": y2_,
+                "confidence": c,
+                "class_name": _MOCK_CLASSES[i],
+                "class_id": i,
+            }
+            for (x1_, y1_, x2_, y2_), c, i in zip(boxes, conf.tolist(), ids.tolist())
         ]
-        n = random.randint(1, 4)
-        detections = []
-        for _ in range(n):
-            cls_name, cls_id = random.choice(classes)
-            conf = round(random.uniform(max(confidence, 0.5), 0.99), 4)
-            # Generate box proportional to actual image dimensions
-            box_w = random.uniform(img_w * 0.08, img_w * 0.30)
-            box_h = random.uniform(img_h * 0.08, img_h * 0.30)
-            x1 = random.uniform(img_w * 0.05, img_w - box_w - img_w * 0.05)
-            y1 = random.uniform(img_h * 0.05, img_h - box_h - img_h * 0.05)
-            detections.append({
-                "x1": round(x1, 1),
-                "y1": round(y1, 1),
-                "x2": round(x1 + box_w, 1),
-                "y2": round(y1 + box_h, 1),
-                "confidence": conf,
-                "class_name": cls_name,
-                "class_id": cls_id,
-            })
-        return detections
 
     # Well-known model metadata for display purposes
     _KNOWN_MODELS: dict[str, dict] = {
@@ -168,41 +250,64 @@ class DetectorService:
         "yolov11m": {"name": "YOLOv11 Medium", "params": "20.1M", "speed": "slow"},
     }
 
+    @staticmethod
+    def _scan_dirs() -> list[Path]:
+        dirs = [WEIGHTS_DIR]
+        if _HAS_ULTRALYTICS:
+            # Hub download locations (Linux/macOS cache, Windows roaming)
+            dirs.append(Path.home() / ".cache" / "ultralytics")
+            dirs.append(Path.home() / "AppData" / "Roaming" / "Ultralytics")
+        return dirs
+
     @property
     def available_models(self) -> list[dict]:
         """
-        Dynamically scan the weights directory for .pt / .onnx files
-        and return a list of available models.
+        Scan the weights directory (and the Ultralytics download cache) for
+        .pt / .onnx files and return a list of available models.
+
+        Only top-level entries are scanned, so the result is cached until a
+        scanned directory's mtime or the set of loaded models changes.
         """
+        dirs = self._scan_dirs()
+        key = (
+            tuple(d.stat().st_mtime_ns if d.is_dir() else 0 for d in dirs),
+            frozenset(self._models),
+        )
+        if self._models_cache is not None and self._models_cache[0] == key:
+            return self._models_cache[1]
+
+        models = self._build_model_list(dirs)
+        self._models_cache = (key, models)
+        return models
+
+    def _build_model_list(self, dirs: list[Path]) -> list[dict]:
         found: dict[str, dict] = {}
+        sizes: dict[str, int] = {}
 
         # Scan weights directory
-        if WEIGHTS_DIR.exists():
+        if WEIGHTS_DIR.is_dir():
             for f in WEIGHTS_DIR.iterdir():
-                if f.suffix in (".pt", ".onnx") and f.stat().st_size > 0:
-                    model_id = f.stem  # e.g. "yolov8n" from "yolov8n.pt"
-                    if model_id not in found:
-                        found[model_id] = {"pt": False, "onnx": False}
+                if f.suffix in (".pt", ".onnx"):
+                    size = f.stat().st_size
+                    if size == 0:
+                        continue
+                    # e.g. "yolov8n" from "yolov8n.pt" / "yolov8n.fp16.onnx"
+                    model_id = f.stem.split(".", 1)[0]
+                    avail = found.setdefault(model_id, {"pt": False, "onnx": False})
                     if f.suffix == ".pt":
-                        found[model_id]["pt"] = True
+                        avail["pt"] = True
+                        sizes[model_id] = size
                     else:
-                        found[model_id]["onnx"] = True
+                        avail["onnx"] = True
 
         # Also check ultralytics cache for downloaded models
-        if _HAS_ULTRALYTICS:
+        for search_dir in dirs[1:]:
             try:
-                from ultralytics import YOLO
-                cache_dir = Path.home() / ".cache" / "ultralytics"
-                # The hub downloads to a predictable location; also check YOLO default
-                for search_dir in [cache_dir, Path.home() / "AppData" / "Roaming" / "Ultralytics"]:
-                    if search_dir.exists():
-                        for f in search_dir.rglob("*.pt"):
-                            model_id = f.stem
-                            if model_id not in found:
-                                found[model_id] = {"pt": True, "onnx": False}
-                            else:
-                                found[model_id]["pt"] = True
-            except Exception:
+                if search_dir.is_dir():
+                    for f in search_dir.iterdir():
+                        if f.suffix == ".pt":
+                            found.setdefault(f.stem, {"pt": True, "onnx": False})["pt"] = True
+            except OSError:
                 pass
 
         # Also mark already-loaded models
@@ -214,10 +319,7 @@ class DetectorService:
         models = []
         for model_id, avail in sorted(found.items()):
             meta = self._KNOWN_MODELS.get(model_id, {})
-            file_size = None
-            pt_path = WEIGHTS_DIR / f"{model_id}.pt"
-            if pt_path.exists():
-                file_size = round(pt_path.stat().st_size / (1024 * 1024), 1)
+            size = sizes.get(model_id)
             models.append({
                 "id": model_id,
                 "name": meta.get("name", model_id),
@@ -226,7 +328,7 @@ class DetectorService:
                 "weights_available": avail.get("pt", False),
                 "onnx_available": avail.get("onnx", False),
                 "loaded": model_id in self._models,
-                "file_size_mb": file_size,
+                "file_size_mb": round(size / (1024 * 1024), 1) if size is not None else None,
             })
 
         # If nothing found, show a hint list of downloadable models
@@ -12,6 +12,8 @@ import random
 import time
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Try to import pymavlink
@@ -24,6 +26,14 @@ except ImportError:
     logger.warning("pymavlink not installed — using simulated flight controller")
 
 
+# Simulated mission flight: per-tick step toward the next waypoint, and the
+# distance at which a waypoint counts as reached (degrees)
+_SIM_STEP_DEG = 0.00003
+_WP_REACHED_DEG = 0.00005
+
+_rng = np.random.default_rng()
+
+
 class FlightCommand:
     """Represents a flight command to be sent to the UAV."""
     TAKEOFF = "takeoff"
@@ -211,30 +221,37 @@ class UAVConnection:
         logger.info("UAV %s mission started", self.uav_id)
         return True
 
+    def _sim_target(self) -> dict | None:
+        """Waypoint the simulated UAV is flying toward, if it is moving on a mission."""
+        if self._sim_flying and self.flight_mode == "AUTO" and self.current_wp < len(self.mission_items):
+            return self.mission_items[self.current_wp]
+        return None
+
     def get_telemetry(self) -> dict:
         """Get current telemetry data (real or simulated)."""
         if self._mavconn:
             # Real telemetry would be read from MAVLink messages
             pass
 
-        # Simulated telemetry with slight movement
-        if self._sim_flying and self.flight_mode == "AUTO" and self.mission_items:
-            # Simulate moving toward next waypoint
-            if self.current_wp < len(self.mission_items):
-                target = self.mission_items[self.current_wp]
-                dlat = target["lat"] - self._sim_lat
-                dlng = target["lng"] - self._sim_lng
-                dist = math.sqrt(dlat**2 + dlng**2)
-                if dist < 0.00005:
-                    self.current_wp += 1
-                else:
-                    step = min(0.00003, dist)
-                    self._sim_lat += (dlat / dist) * step
-                    self._sim_lng += (dlng / dist) * step
-                    self._sim_heading = math.degrees(math.atan2(dlng, dlat)) % 360
+        # Simulated telemetry with slight movement toward the next waypoint
+        target = self._sim_target()
+        if target is not None:
+            dlat = target["lat"] - self._sim_lat
+            dlng = target["lng"] - self._sim_lng
+            # Arrival test on the squared distance, so no sqrt when the waypoint is reached
+            if dlat * dlat + dlng * dlng < _WP_REACHED_DEG * _WP_REACHED_DEG:
+                self.current_wp += 1
+            else:
+                dist = math.hypot(dlat, dlng)
+                scale = (_SIM_STEP_DEG if dist > _SIM_STEP_DEG else dist) / dist
+                self._sim_lat += dlat * scale
+                self._sim_lng += dlng * scale
+                self._sim_heading = math.degrees(math.atan2(dlng, dlat)) % 360
 
         self._sim_battery = max(10, self._sim_battery - random.uniform(0, 0.01))
+        return self._telemetry_dict()
 
+    def _telemetry_dict(self) -> dict:
         return {
             "uav_id": self.uav_id,
             "connected": self.connected,
@@ -277,7 +294,30 @@ class FlightControllerService:
             await conn.disconnect()
 
     def list_connections(self) -> list[dict]:
-        return [conn.get_telemetry() for conn in self._connections.values()]
+        """Telemetry for every UAV; the simulation advances all of them in one vectorized step."""
+        conns = list(self._connections.values())
+        if not conns:
+            return []
+
+        moving = [(conn, target) for conn in conns if (target := conn._sim_target()) is not None]
+        if moving:
+            pos = np.array([(conn._sim_lat, conn._sim_lng) for conn, _ in moving])
+            delta = np.array([(t["lat"], t["lng"]) for _, t in moving]) - pos
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+            arrived = dist < _WP_REACHED_DEG
+            # Unit direction times step; arrived rows are not moved, so their divisor is irrelevant
+            scale = np.minimum(_SIM_STEP_DEG, dist) / np.where(arrived, 1.0, dist)
+            new_pos = pos + delta * scale[:, None]
+            heading = np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) % 360
+            for (conn, _), done, (lat, lng), hdg in zip(moving, arrived.tolist(), new_pos.tolist(), heading.tolist()):
+                if done:
+                    conn.current_wp += 1
+                else:
+                    conn._sim_lat, conn._sim_lng, conn._sim_heading = lat, lng, hdg
+
+        for conn, drain in zip(conns, _rng.uniform(0, 0.01, len(conns)).tolist()):
+            conn._sim_battery = max(10, conn._sim_battery - drain)
+        return [conn._telemetry_dict() for conn in conns]
 
     async def send_command(self, uav_id: str, command: str, **kwargs) -> dict:
         """Send a command to a specific UAV."""
@@ -5,10 +5,16 @@ Provides accelerated inference using ONNX Runtime when .onnx model files
 are available, with automatic fallback to the standard detector service.
 """
 
+import asyncio
+import hashlib
 import logging
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +38,24 @@ except ImportError:
     if _HAS_NUMPY:
         logger.warning("ONNX Runtime not installed — ONNX inference unavailable")
 
+# OpenCV decodes/resizes faster than Pillow; Pillow remains the fallback
+try:
+    import cv2
+    _HAS_CV2 = True
+except ImportError:
+    _HAS_CV2 = False
+
 WEIGHTS_DIR = Path(__file__).resolve().parent.parent.parent / "weights"
+# Graph-optimized copies of the .onnx files, written on first load (subdir so
+# the model scans, which only look at top-level *.onnx, never list them)
+OPTIMIZED_DIR = WEIGHTS_DIR / ".ort_optimized"
+
+# Dummy forward passes at load time (CUDA kernel selection, arena growth)
+WARMUP_RUNS = 2
+
+# Micro-batching for models exported with a dynamic batch axis
+MAX_BATCH = 8
+BATCH_WAIT_S = 0.005  # how long the first request waits for others to join
 
 # Default YOLO class names (COCO-based UAV detection)
 DEFAULT_CLASS_NAMES = {
@@ -42,12 +65,40 @@ DEFAULT_CLASS_NAMES = {
 }
 
 
-def _preprocess_image(image_bytes: bytes, input_size: int = 640) -> np.ndarray:
-    """Preprocess image bytes to ONNX input tensor [1, 3, H, W] float32."""
+def _preprocess_image(image: bytes | BinaryIO, input_size: int = 640, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Preprocess image bytes or a file to ONNX input tensor [1, 3, H, W] float32.
+
+    With OpenCV, the normalized RGB planes are written straight into ``out``
+    (a reusable [1, 3, H, W] buffer) when one is given. Formats OpenCV can't
+    decode (e.g. GIF) go through Pillow.
+    """
+    if _HAS_CV2:
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            data = image
+        else:
+            image.seek(0)
+            data = image.read()
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            return _preprocess_pil(data, input_size)
+        img = cv2.resize(img, (input_size, input_size), interpolation=cv2.INTER_LINEAR)
+        if out is None:
+            out = np.empty((1, 3, input_size, input_size), dtype=np.float32)
+        # BGR HWC uint8 -> RGB CHW float32 in [0, 1], one pass, no intermediate arrays
+        np.multiply(
+            img[:, :, ::-1].transpose(2, 0, 1), np.float32(1 / 255),
+            out=out[0], dtype=np.float32, casting="unsafe",
+        )
+        return out
+    return _preprocess_pil(image, input_size)
+
+
+def _preprocess_pil(image: bytes | BinaryIO, input_size: int) -> np.ndarray:
     try:
         from PIL import Image
-        import io
-        img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        from app.core.imaging import as_stream
+        img = Image.open(as_stream(image)).convert("RGB")
         img = img.resize((input_size, input_size))
         arr = np.array(img, dtype=np.float32) / 255.0
         # HWC -> CHW -> NCHW
@@ -74,7 +125,7 @@ def _postprocess_yolo(
     if class_names is None:
         class_names = DEFAULT_CLASS_NAMES
 
-    output = outputs[0]  # shape: [1, 4+num_classes, num_boxes]
+    output = outputs[0].astype(np.float32, copy=False)  # shape: [1, 4+num_classes, num_boxes]; fp16 models upcast
 
     if output.ndim == 3:
         output = output[0]  # [4+num_classes, num_boxes]
@@ -90,58 +141,247 @@ def _postprocess_yolo(
     else:
         sx = sy = 1.0
 
-    detections = []
-    for row in output:
-        x_c, y_c, w, h = row[:4]
-        class_scores = row[4:]
-        class_id = int(np.argmax(class_scores))
-        conf = float(class_scores[class_id])
-
-        if conf < confidence:
-            continue
-
-        x1 = (x_c - w / 2) * sx
-        y1 = (y_c - h / 2) * sy
-        x2 = (x_c + w / 2) * sx
-        y2 = (y_c + h / 2) * sy
-
-        detections.append({
-            "x1": round(float(x1), 1),
-            "y1": round(float(y1), 1),
-            "x2": round(float(x2), 1),
-            "y2": round(float(y2), 1),
-            "confidence": round(conf, 4),
+    # Best class per anchor, then drop low-confidence anchors before any per-box work
+    scores = output[:, 4:]
+    class_ids = scores.argmax(axis=1)
+    confs = scores[np.arange(len(scores)), class_ids]
+    mask = confs >= confidence
+    boxes, class_ids, confs = output[mask, :4], class_ids[mask], confs[mask]
+
+    # xywh -> xyxy, rescaled to the original image (float64 so rounding is exact)
+    centers = boxes[:, :2].astype(np.float64)
+    half = boxes[:, 2:4].astype(np.float64) / 2
+    xyxy = np.concatenate([centers - half, centers + half], axis=1) * (sx, sy, sx, sy)
+
+    keep = _nms(xyxy, confs, iou_threshold=0.45, max_det=100)
+    xyxy, confs, class_ids = xyxy[keep], confs[keep], class_ids[keep]
+
+    return [
+        {
+            "x1": x1, "y1": y1, "x2": x2, "y2": y2,
+            "confidence": conf,
             "class_name": class_names.get(class_id, f"class_{class_id}"),
             "class_id": class_id,
-        })
-
-    # NMS (simple greedy)
-    detections.sort(key=lambda d: d["confidence"], reverse=True)
-    keep = []
-    for det in detections:
-        overlap = False
-        for kept in keep:
-            iou = _compute_iou(det, kept)
-            if iou > 0.45:
-                overlap = True
-                break
-        if not overlap:
-            keep.append(det)
-
-    return keep[:100]  # max 100 detections
-
-
-def _compute_iou(a: dict, b: dict) -> float:
-    """Compute IoU between two detection boxes."""
-    x1 = max(a["x1"], b["x1"])
-    y1 = max(a["y1"], b["y1"])
-    x2 = min(a["x2"], b["x2"])
-    y2 = min(a["y2"], b["y2"])
-    inter = max(0, x2 - x1) * max(0, y2 - y1)
-    area_a = (a["x2"] - a["x1"]) * (a["y2"] - a["y1"])
-    area_b = (b["x2"] - b["x1"]) * (b["y2"] - b["y1"])
-    union = area_a + area_b - inter
-    return inter / union if union > 0 else 0.0
+        }
+        for (x1, y1, x2, y2), conf, class_id in zip(
+            xyxy.round(1).tolist(), confs.astype(np.float64).round(4).tolist(), class_ids.tolist(),
+        )
+    ]
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.45, max_det: int = 100) -> np.ndarray:
+    """
+    Greedy class-agnostic NMS over xyxy boxes; returns kept indices, best score first.
+
+    Each round compares the current best box against all remaining ones in a
+    single array operation.
+    """
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep: list[int] = []
+    while order.size and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        inter = (
+            np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+            * np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        )
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.intp)
+
+
+def _input_size(session: Any) -> int:
+    dim = session.get_inputs()[0].shape[-1]
+    return dim if isinstance(dim, int) else 640
+
+
+def _input_dtype(session: Any) -> type:
+    """np.float16 for FP16-exported models, else np.float32."""
+    return np.float16 if session.get_inputs()[0].type == "tensor(float16)" else np.float32
+
+
+def quantize_int8(model_name: str) -> Path:
+    """
+    Build weights/{model_name}.int8.onnx from the FP32 model (offline, one-off).
+
+    Dynamic INT8 quantization: weights stored as int8, activations quantized
+    at run time. Select it with ONNX_PRECISION=int8.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    src = WEIGHTS_DIR / f"{model_name}.onnx"
+    dst = WEIGHTS_DIR / f"{model_name}.int8.onnx"
+    quantize_dynamic(str(src), str(dst), weight_type=QuantType.QInt8)
+    return dst
+
+
+def _probe_size(image: bytes | BinaryIO) -> tuple[int, int] | None:
+    """(width, height) from the image header via Pillow, or None."""
+    try:
+        from PIL import Image
+        from app.core.imaging import as_stream
+        return Image.open(as_stream(image)).size
+    except Exception:
+        return None
+
+
+def _prepare(
+    image: bytes | BinaryIO, input_size: int, image_size: tuple[int, int] | None,
+) -> tuple[np.ndarray, tuple[int, int] | None]:
+    """Worker thread: a fresh input tensor plus the original (width, height)."""
+    tensor = _preprocess_image(image, input_size)
+    return tensor, image_size or _probe_size(image)
+
+
+def _fail(items: list[tuple], exc: BaseException):
+    """Set exc on every queued request's future that isn't resolved yet."""
+    for *_, future in items:
+        if not future.done():
+            future.set_exception(exc)
+
+
+class _Batcher:
+    """
+    Collects concurrent requests for one model into a single [N, 3, H, W] forward pass.
+
+    The first queued request waits at most BATCH_WAIT_S for up to MAX_BATCH
+    others; the batch runs in a worker thread so the event loop stays free.
+    The queue and collector task belong to the loop that last submitted, and
+    are recreated when a different loop (tests, reload) starts using the batcher.
+    """
+
+    def __init__(self, session: Any):
+        self._session = session
+        self._input_name = session.get_inputs()[0].name
+        self._input_size = _input_size(session)
+        self._dtype = _input_dtype(session)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, tensor: np.ndarray, confidence: float, orig_size: tuple[int, int] | None) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._queue, self._task = loop, asyncio.Queue(), None
+        future = loop.create_future()
+        self._queue.put_nowait((tensor, confidence, orig_size, future))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return await future
+
+    async def close(self):
+        """Stop the collector task and fail any requests still queued."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        while self._queue is not None and not self._queue.empty():
+            _fail([self._queue.get_nowait()], RuntimeError("ONNX batcher closed"))
+
+    async def _collect(self) -> list[tuple]:
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        deadline = loop.time() + BATCH_WAIT_S
+        try:
+            while len(items) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            _fail(items, RuntimeError("ONNX batcher closed"))
+            raise
+        return items
+
+    def _infer(self, items: list[tuple]) -> list[list[dict] | Exception]:
+        """Worker thread: one forward pass for the batch, then per-request post-processing."""
+        batch = np.concatenate([item[0] for item in items]).astype(self._dtype, copy=False)
+        outputs = self._session.run(None, {self._input_name: batch})
+        results: list[list[dict] | Exception] = []
+        for i, (_, confidence, orig_size, _) in enumerate(items):
+            try:
+                results.append(_postprocess_yolo(
+                    [out[i:i + 1] for out in outputs], confidence, self._input_size, orig_size=orig_size,
+                ))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            try:
+                results = await asyncio.to_thread(self._infer, items)
+            except asyncio.CancelledError:
+                _fail(items, RuntimeError("ONNX batcher closed"))
+                raise
+            except Exception as e:
+                # Never leave a caller waiting: the whole batch fails together
+                results = [e] * len(items)
+            for (*_, future), result in zip(items, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+def _optimized_path(onnx_path: Path, providers: list) -> Path:
+    """Cache path for an optimized graph, keyed by the onnxruntime version and providers."""
+    names = ",".join(p[0] if isinstance(p, tuple) else p for p in providers)
+    key = hashlib.sha1(f"{ort.__version__}|{names}".encode()).hexdigest()[:10]
+    return OPTIMIZED_DIR / f"{onnx_path.stem}.{key}.onnx"
+
+
+def _load_session(model_path: Path, providers: list, optimize: bool, save_to: Path | None = None) -> Any:
+    """
+    Create an InferenceSession. With save_to, the optimized graph is written to a
+    per-process temp file and renamed into place, so concurrent workers never see
+    a partial file; a failure to write the cache only costs the optimization next time.
+    """
+    so = ort.SessionOptions()
+    so.enable_cpu_mem_arena = True
+    so.graph_optimization_level = (
+        ort.GraphOptimizationLevel.ORT_ENABLE_ALL if optimize else ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    )
+    tmp_path = None
+    # TensorRT builds its own engines; ORT can't serialize graphs partitioned to it
+    if save_to is not None and "TensorrtExecutionProvider" not in _ORT_PROVIDERS:
+        try:
+            save_to.parent.mkdir(exist_ok=True)
+            tmp_path = save_to.with_name(f"{save_to.stem}.{os.getpid()}.tmp.onnx")
+            so.optimized_model_filepath = str(tmp_path)
+        except OSError as e:
+            logger.warning("Not caching optimized model (%s): %s", save_to.parent, e)
+
+    logger.info("Loading ONNX model: %s (providers: %s)", model_path, providers)
+    try:
+        session = ort.InferenceSession(str(model_path), sess_options=so, providers=providers)
+    except Exception:
+        if tmp_path is None:
+            raise
+        tmp_path.unlink(missing_ok=True)
+        # Retry without the cache write in case that is what failed
+        logger.warning("Loading %s with optimized-model output failed; retrying without", model_path)
+        return _load_session(model_path, providers, optimize)
+
+    if tmp_path is not None:
+        try:
+            os.replace(tmp_path, save_to)
+        except OSError as e:
+            logger.warning("Could not store optimized model %s: %s", save_to, e)
+            tmp_path.unlink(missing_ok=True)
+    return session
 
 
 class OnnxDetectorService:
@@ -149,68 +389,148 @@ class OnnxDetectorService:
 
     def __init__(self):
         self._sessions: dict[str, Any] = {}
+        # input_size -> reusable [1, 3, H, W] input tensor
+        self._input_bufs: dict[int, np.ndarray] = {}
+        # model_name -> (IOBinding, device-resident input OrtValue) on CUDA sessions
+        self._io_bindings: dict[str, tuple[Any, Any]] = {}
+        self._batchers: dict[str, _Batcher] = {}
+        # Serializes detect_image's use of the shared input buffers / IOBindings
+        self._run_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # (model_name, precision) -> weights variant actually loaded
+        self._variants: dict[tuple[str, str], str] = {}
+
+    def _variant(self, model_name: str, precision: str | None) -> str:
+        """Weights file stem for the requested precision, falling back to the FP32 model."""
+        precision = precision or settings.ONNX_PRECISION
+        if precision == "fp32":
+            return model_name
+        key = (model_name, precision)
+        variant = self._variants.get(key)
+        if variant is None:
+            variant = f"{model_name}.{precision}"
+            if not (WEIGHTS_DIR / f"{variant}.onnx").exists():
+                logger.info("No %s weights for %s, using fp32", precision, model_name)
+                variant = model_name
+            self._variants[key] = variant
+        return variant
 
     def _get_session(self, model_name: str) -> Any:
+        """
+        Cached InferenceSession for a weights file, built on first use.
+
+        Building (graph optimization, cache write, cuDNN algorithm search,
+        warmup) takes seconds: async code goes through _get_session_async,
+        and preload() does it at startup.
+        """
         if model_name in self._sessions:
             return self._sessions[model_name]
 
         if not _HAS_ORT:
             return None
 
+        # One build per model even when several threads miss at once
+        with self._load_lock:
+            if model_name in self._sessions:
+                return self._sessions[model_name]
+            return self._build_session(model_name)
+
+    def _build_session(self, model_name: str) -> Any:
         onnx_path = WEIGHTS_DIR / f"{model_name}.onnx"
         if not onnx_path.exists():
             logger.debug("ONNX model not found: %s", onnx_path)
             return None
 
         # Prefer CUDA > TensorRT > CPU
-        providers = []
+        providers: list = []
         if "TensorrtExecutionProvider" in _ORT_PROVIDERS:
             providers.append("TensorrtExecutionProvider")
         if "CUDAExecutionProvider" in _ORT_PROVIDERS:
-            providers.append("CUDAExecutionProvider")
+            providers.append(("CUDAExecutionProvider", {
+                "cudnn_conv_algo_search": "EXHAUSTIVE",
+                "do_copy_in_default_stream": True,
+            }))
         providers.append("CPUExecutionProvider")
 
-        logger.info("Loading ONNX model: %s (providers: %s)", onnx_path, providers)
-        session = ort.InferenceSession(str(onnx_path), providers=providers)
+        opt_path = _optimized_path(onnx_path, providers)
+        session = None
+        try:
+            fresh = opt_path.stat().st_mtime >= onnx_path.stat().st_mtime
+        except OSError:
+            fresh = False
+        if fresh:
+            # Already optimized for this machine; skip graph optimization on load
+            try:
+                session = _load_session(opt_path, providers, optimize=False)
+            except Exception as e:
+                logger.warning("Ignoring unusable optimized model %s: %s", opt_path, e)
+        if session is None:
+            session = _load_session(onnx_path, providers, optimize=True, save_to=opt_path)
+        self._warmup(session)
         self._sessions[model_name] = session
         return session
 
+    async def _get_session_async(self, model_name: str) -> Any:
+        session = self._sessions.get(model_name)
+        if session is None and _HAS_ORT:
+            session = await asyncio.to_thread(self._get_session, model_name)
+        return session
+
+    async def preload(self, model_names: list[str]):
+        """Build sessions for these models (configured precision) before serving traffic."""
+        for name in model_names:
+            try:
+                if await self._get_session_async(self._variant(name, None)) is not None:
+                    logger.info("ONNX model preloaded: %s", name)
+            except Exception:
+                logger.exception("ONNX preload failed for %s", name)
+
+    @staticmethod
+    def _warmup(session: Any):
+        input_meta = session.get_inputs()[0]
+        size = _input_size(session)
+        dummy = np.zeros((1, 3, size, size), dtype=_input_dtype(session))
+        start = time.perf_counter()
+        for _ in range(WARMUP_RUNS):
+            session.run(None, {input_meta.name: dummy})
+        logger.info("ONNX warmup: %d runs, %.1fms", WARMUP_RUNS, (time.perf_counter() - start) * 1000)
+
     def detect_image(
         self,
-        image_bytes: bytes,
+        image: bytes | BinaryIO,
         model_name: str = "yolov8n",
         confidence: float = 0.5,
         image_size: tuple[int, int] | None = None,
+        precision: str | None = None,
     ) -> list[dict] | None:
         """
         Run ONNX inference. Returns detections list, or None if ONNX
         model is not available (caller should fallback).
 
         image_size: (width, height) of original image for coordinate rescaling.
+        precision: "fp32" / "fp16" / "int8" weights variant (default: ONNX_PRECISION).
         """
+        model_name = self._variant(model_name, precision)
         session = self._get_session(model_name)
         if session is None:
             return None
 
         # Read original image size if not provided
-        orig_size = image_size
-        if orig_size is None:
-            try:
-                from PIL import Image
-                import io
-                img = Image.open(io.BytesIO(image_bytes))
-                orig_size = img.size  # (width, height)
-            except Exception:
-                orig_size = None
+        orig_size = image_size or _probe_size(image)
 
         start = time.perf_counter()
 
         # Get input shape from model
         input_meta = session.get_inputs()[0]
-        input_size = input_meta.shape[-1] if isinstance(input_meta.shape[-1], int) else 640
-
-        tensor = _preprocess_image(image_bytes, input_size)
-        outputs = session.run(None, {input_meta.name: tensor})
+        input_size = _input_size(session)
+
+        # The reused input buffer and IOBinding are shared; one request at a time
+        with self._run_lock:
+            buf = self._input_bufs.get(input_size)
+            if buf is None:
+                buf = self._input_bufs[input_size] = np.empty((1, 3, input_size, input_size), dtype=np.float32)
+            tensor = _preprocess_image(image, input_size, out=buf).astype(_input_dtype(session), copy=False)
+            outputs = self._run(session, model_name, input_meta.name, tensor)
         detections = _postprocess_yolo(outputs, confidence, input_size, orig_size=orig_size)
 
         elapsed_ms = (time.perf_counter() - start) * 1000
@@ -220,12 +540,78 @@ class OnnxDetectorService:
         )
         return detections
 
+    async def detect_image_async(
+        self,
+        image: bytes | BinaryIO,
+        model_name: str = "yolov8n",
+        confidence: float = 0.5,
+        image_size: tuple[int, int] | None = None,
+        precision: str | None = None,
+    ) -> list[dict] | None:
+        """
+        Like detect_image, but concurrent calls share batched forward passes.
+
+        Needs a model exported with a dynamic batch axis; static batch-1
+        models run through detect_image unchanged.
+        """
+        model_name = self._variant(model_name, precision)
+        session = await self._get_session_async(model_name)
+        if session is None:
+            return None
+        if isinstance(session.get_inputs()[0].shape[0], int):
+            return await asyncio.to_thread(self.detect_image, image, model_name, confidence, image_size, "fp32")
+
+        batcher = self._batchers.get(model_name)
+        if batcher is None:
+            batcher = self._batchers[model_name] = _Batcher(session)
+        # Decode/resize off the event loop; each request owns its tensor until the batch is concatenated
+        tensor, orig_size = await asyncio.to_thread(_prepare, image, _input_size(session), image_size)
+        return await batcher.submit(tensor, confidence, orig_size)
+
+    async def close(self):
+        """Stop the batchers' background tasks (app shutdown)."""
+        batchers, self._batchers = list(self._batchers.values()), {}
+        for batcher in batchers:
+            await batcher.close()
+
+    def _run(self, session: Any, model_name: str, input_name: str, tensor: np.ndarray) -> list[np.ndarray]:
+        """
+        Run one forward pass.
+
+        On CUDA the input lives in a reused device OrtValue and outputs stay
+        bound on the device until the single copy back for post-processing;
+        other providers take the plain session.run path.
+        """
+        if "CUDAExecutionProvider" not in session.get_providers():
+            return session.run(None, {input_name: tensor})
+
+        bound = self._io_bindings.get(model_name)
+        if bound is None or bound[1].shape() != list(tensor.shape):
+            binding = session.io_binding()
+            device_input = ort.OrtValue.ortvalue_from_numpy(tensor, "cuda", 0)
+            binding.bind_ortvalue_input(input_name, device_input)
+            for out in session.get_outputs():
+                binding.bind_output(out.name, "cuda", 0)
+            bound = self._io_bindings[model_name] = (binding, device_input)
+        else:
+            bound[1].update_inplace(tensor)
+
+        binding = bound[0]
+        session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()
+
     @property
     def available_onnx_models(self) -> list[str]:
-        """List model names that have .onnx files available."""
+        """
+        List model names that have .onnx files available.
+
+        Export with a dynamic batch axis (e.g. ``yolo export format=onnx dynamic=True``)
+        to enable request batching in detect_image_async.
+        """
         if not WEIGHTS_DIR.exists():
             return []
-        return [p.stem for p in WEIGHTS_DIR.glob("*.onnx")]
+        # {model}.fp16.onnx / {model}.int8.onnx are precision variants, not separate models
+        return [p.stem for p in WEIGHTS_DIR.glob("*.onnx") if "." not in p.stem]
 
     @property
     def is_available(self) -> bool:
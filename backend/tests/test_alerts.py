@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.alert import Alert
+from tests.conftest import TestSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_list_alerts_cursor_keeps_created_at_ties(auth_client: AsyncClient):
+    # Five alerts with the same timestamp, paged two at a time
+    same_ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with TestSessionLocal() as session:
+        session.add_all([Alert(title=f"告警{i}", created_at=same_ts) for i in range(5)])
+        await session.commit()
+
+    seen: list[int] = []
+    params: dict = {"limit": 2}
+    while True:
+        resp = await auth_client.get("/api/alerts/", params=params)
+        assert resp.status_code == 200
+        page = resp.json()["alerts"]
+        if not page:
+            break
+        seen.extend(a["id"] for a in page)
+        params = {"limit": 2, "cursor": page[-1]["created_at"], "cursor_id": page[-1]["id"]}
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 5
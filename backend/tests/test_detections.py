@@ -0,0 +1,27 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.cache import cache_clear
+from app.models.detection_result import DetectionBoxRow, DetectionResult
+from tests.conftest import TestSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_stats_counts_results_without_box_rows(auth_client: AsyncClient):
+    async with TestSessionLocal() as session:
+        # Written before detection_boxes existed: JSON only, no box rows
+        session.add(DetectionResult(
+            detections=[{"class_name": "drone", "confidence": 0.9}, {"class_name": "bird", "confidence": 0.6}],
+            detection_count=2,
+        ))
+        # Written since: box rows alongside the JSON
+        current = DetectionResult(detections=[{"class_name": "drone", "confidence": 0.8}], detection_count=1)
+        session.add(current)
+        await session.flush()
+        session.add(DetectionBoxRow(result_id=current.id, class_name="drone", confidence=8000))
+        await session.commit()
+    await cache_clear("detections")
+
+    resp = await auth_client.get("/api/detections/stats")
+    assert resp.status_code == 200
+    assert resp.json()["class_distribution"] == {"drone": 2, "bird": 1}
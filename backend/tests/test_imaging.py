@@ -0,0 +1,18 @@
+import struct
+
+from app.core.imaging import sniff_size
+
+
+def test_sniff_size_png():
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 1920, 1080)
+    assert sniff_size(header + b"\x08\x02\x00\x00\x00") == (1920, 1080)
+
+
+def test_sniff_size_jpeg():
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    sof0 = b"\xff\xc0" + struct.pack(">H", 17) + b"\x08" + struct.pack(">HH", 720, 1280) + b"\x03" + b"\x00" * 9
+    assert sniff_size(b"\xff\xd8" + app0 + sof0 + b"\xff\xd9") == (1280, 720)
+
+
+def test_sniff_size_unknown_format():
+    assert sniff_size(b"GIF89a" + b"\x00" * 32) is None
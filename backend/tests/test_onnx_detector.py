@@ -0,0 +1,148 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from app.services.onnx_detector import DEFAULT_CLASS_NAMES, _Batcher, _postprocess_yolo, _preprocess_image
+
+
+def _gif_bytes(color: tuple[int, int, int], size: tuple[int, int] = (64, 48)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="GIF")
+    return buf.getvalue()
+
+
+def test_preprocess_gif_falls_back_to_pillow():
+    tensor = _preprocess_image(_gif_bytes((255, 0, 0)), input_size=32)
+    assert tensor.shape == (1, 3, 32, 32)
+    assert tensor.dtype == np.float32
+    # RGB channel order, normalized to [0, 1]
+    assert np.allclose(tensor[0, 0], 1.0, atol=0.02)
+    assert np.allclose(tensor[0, 1:], 0.0, atol=0.02)
+
+
+def test_preprocess_gif_file_object():
+    tensor = _preprocess_image(io.BytesIO(_gif_bytes((0, 0, 255))), input_size=16)
+    assert tensor.shape == (1, 3, 16, 16)
+    assert np.allclose(tensor[0, 2], 1.0, atol=0.02)
+
+
+def _yolo_output(anchors: list[tuple], num_classes: int = 3, num_boxes: int = 16) -> np.ndarray:
+    """[1, 4+nc, N] tensor from (cx, cy, w, h, class_id, score) anchors; the rest score 0."""
+    out = np.zeros((1, 4 + num_classes, num_boxes), dtype=np.float32)
+    for i, (cx, cy, w, h, class_id, score) in enumerate(anchors):
+        out[0, :4, i] = (cx, cy, w, h)
+        out[0, 4 + class_id, i] = score
+    return out
+
+
+def _greedy_reference(output: np.ndarray, confidence: float, input_size: int, orig_size) -> list[dict]:
+    """The per-detection loop _postprocess_yolo replaced: sort by score, suppress IoU > 0.45, cap at 100."""
+    sx, sy = (orig_size[0] / input_size, orig_size[1] / input_size) if orig_size else (1.0, 1.0)
+    dets = []
+    for row in output[0].T.astype(np.float64):
+        class_id = int(row[4:].argmax())
+        conf = row[4 + class_id]
+        if conf < confidence:
+            continue
+        cx, cy, w, h = row[:4]
+        dets.append({
+            "x1": round((cx - w / 2) * sx, 1), "y1": round((cy - h / 2) * sy, 1),
+            "x2": round((cx + w / 2) * sx, 1), "y2": round((cy + h / 2) * sy, 1),
+            "confidence": round(conf, 4),
+            "class_name": DEFAULT_CLASS_NAMES.get(class_id, f"class_{class_id}"),
+            "class_id": class_id,
+        })
+
+    def iou(a, b):
+        inter = (max(0, min(a["x2"], b["x2"]) - max(a["x1"], b["x1"]))
+                 * max(0, min(a["y2"], b["y2"]) - max(a["y1"], b["y1"])))
+        union = ((a["x2"] - a["x1"]) * (a["y2"] - a["y1"])
+                 + (b["x2"] - b["x1"]) * (b["y2"] - b["y1"]) - inter)
+        return inter / union if union > 0 else 0.0
+
+    dets.sort(key=lambda d: d["confidence"], reverse=True)
+    keep: list[dict] = []
+    for det in dets:
+        if all(iou(det, kept) <= 0.45 for kept in keep):
+            keep.append(det)
+    return keep[:100]
+
+
+def test_postprocess_suppresses_overlaps_and_filters_confidence():
+    output = _yolo_output([
+        (100, 100, 40, 40, 0, 0.9),   # kept
+        (102, 101, 40, 40, 0, 0.8),   # IoU ~0.88 with the first -> suppressed
+        (300, 200, 20, 60, 1, 0.7),   # kept
+        (500, 500, 30, 30, 2, 0.3),   # below threshold
+    ])
+    dets = _postprocess_yolo([output], confidence=0.5, input_size=640)
+    assert [(d["class_name"], d["confidence"]) for d in dets] == [("drone", 0.9), ("bird", 0.7)]
+    assert (dets[0]["x1"], dets[0]["y1"], dets[0]["x2"], dets[0]["y2"]) == (80.0, 80.0, 120.0, 120.0)
+    assert (dets[1]["x1"], dets[1]["y1"], dets[1]["x2"], dets[1]["y2"]) == (290.0, 170.0, 310.0, 230.0)
+
+
+def test_postprocess_rescales_to_original_size():
+    output = _yolo_output([(320, 320, 64, 32, 0, 0.95)])
+    (det,) = _postprocess_yolo([output], confidence=0.5, input_size=640, orig_size=(1280, 960))
+    # sx = 2.0, sy = 1.5
+    assert (det["x1"], det["y1"], det["x2"], det["y2"]) == (576.0, 456.0, 704.0, 504.0)
+
+
+def test_postprocess_caps_at_max_det_best_first():
+    # 150 disjoint boxes on a grid, all above threshold
+    anchors = [(20 + 40 * (i % 15), 20 + 40 * (i // 15), 10, 10, 0, 0.5 + i / 1000) for i in range(150)]
+    dets = _postprocess_yolo([_yolo_output(anchors, num_boxes=150)], confidence=0.5, input_size=640)
+    assert len(dets) == 100
+    confs = [d["confidence"] for d in dets]
+    assert confs == sorted(confs, reverse=True)
+    assert confs[-1] == round(0.5 + 50 / 1000, 4)
+
+
+def test_postprocess_matches_greedy_reference():
+    rng = np.random.default_rng(0)
+    n, nc = 400, 8
+    output = np.zeros((1, 4 + nc, n), dtype=np.float32)
+    # Integer centers, even sizes: xyxy is exact, so rounding can't flip an IoU comparison
+    output[0, 0:2] = rng.integers(0, 640, size=(2, n))
+    output[0, 2:4] = 2 * rng.integers(5, 60, size=(2, n))
+    # Distinct scores that survive rounding to 4 decimals, so both sorts agree
+    scores = rng.permutation(np.arange(1, n + 1)) / (n + 1)
+    output[0, 4 + rng.integers(0, nc, size=n), np.arange(n)] = scores
+
+    for orig_size in (None, (1280, 960)):
+        got = _postprocess_yolo([output], confidence=0.25, input_size=640, orig_size=orig_size)
+        assert got == _greedy_reference(output, 0.25, 640, orig_size)
+        assert got
+
+
+class _FakeSession:
+    """Dynamic-batch session whose output has one confident box per input."""
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="images", shape=["batch", 3, 32, 32], type="tensor(float)")]
+
+    def run(self, _names, feeds):
+        n = feeds["images"].shape[0]
+        out = np.zeros((n, 4 + 3, 8), dtype=np.float32)
+        out[:, :4, 0] = (16, 16, 8, 8)
+        out[:, 4, 0] = 0.9
+        return [out]
+
+
+def test_batcher_survives_a_new_event_loop():
+    batcher = _Batcher(_FakeSession())
+
+    async def detect_twice():
+        tensor = np.zeros((1, 3, 32, 32), dtype=np.float32)
+        results = await asyncio.gather(*(batcher.submit(tensor, 0.5, None) for _ in range(2)))
+        await batcher.close()
+        return results
+
+    # Each asyncio.run is a fresh loop, as in tests or after a reload
+    for _ in range(2):
+        results = asyncio.run(detect_twice())
+        assert [len(dets) for dets in results] == [1, 1]
+        assert results[0][0]["class_name"] == "drone"
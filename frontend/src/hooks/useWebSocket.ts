@@ -7,6 +7,8 @@ interface UseWebSocketOptions {
   onMessage?: (data: any) => void
 }
 
+const textDecoder = new TextDecoder()
+
 export function useWebSocket({ url, enabled = true, reconnectInterval = 3000, onMessage }: UseWebSocketOptions) {
   const [connected, setConnected] = useState(false)
   const [lastMessage, setLastMessage] = useState<any>(null)
@@ -24,6 +26,7 @@ export function useWebSocket({ url, enabled = true, reconnectInterval = 3000, on
 
     try {
       const ws = new WebSocket(wsUrl)
+      ws.binaryType = 'arraybuffer'
       wsRef.current = ws
 
       ws.onopen = () => {
@@ -36,9 +39,15 @@ export function useWebSocket({ url, enabled = true, reconnectInterval = 3000, on
 
       ws.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data)
-          setLastMessage(data)
-          onMessageRef.current?.(data)
+          // Server sends UTF-8 JSON as binary frames
+          const raw = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data)
+          const data = JSON.parse(raw)
+          // Server may coalesce one tick's messages into a single batch frame
+          const items = data?.type === 'batch' && Array.isArray(data.items) ? data.items : [data]
+          for (const item of items) {
+            onMessageRef.current?.(item)
+          }
+          if (items.length) setLastMessage(items[items.length - 1])
         } catch {
           // ignore non-JSON messages
         }